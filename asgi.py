@@ -0,0 +1,202 @@
+"""ASGI serving mode.
+
+Run with ``uvicorn asgi:application --workers 4``. The I/O-bound routes
+(bulk uploads, job status polling, search ZIP and file downloads) are served
+natively with async Redis and database access and streamed responses;
+every other route is the unchanged Flask app behind a WSGI adapter. CV
+parsing still happens in the RQ worker pool.
+"""
+
+import contextlib
+import os
+import tempfile
+
+from a2wsgi import WSGIMiddleware
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import FileResponse, JSONResponse, RedirectResponse
+from starlette.routing import Mount, Route
+
+from app import app as flask_app, cv_zip_entries, get_queue, job_status_payload
+from connections import DEFAULT_CONNECTIONS
+from cv_service import CVService
+from models import db
+from output_store import get_output_store, zip_outputs
+from processing_limits import DEFAULT_LIMITS, upload_size
+
+# RQ job statuses after which the full job has to be loaded.
+FINAL_JOB_STATUSES = {"finished", "failed", "stopped", "canceled"}
+
+_engine = None
+_sessionmaker = None
+_redis = None
+
+
+def get_async_session():
+    global _engine, _sessionmaker
+    if _sessionmaker is None:
+        _engine = create_async_engine(
+            DEFAULT_CONNECTIONS.async_database_uri,
+            **DEFAULT_CONNECTIONS.engine_options(),
+        )
+        _sessionmaker = async_sessionmaker(_engine, expire_on_commit=False)
+    return _sessionmaker()
+
+
+def get_async_redis():
+    global _redis
+    if _redis is None:
+        settings = DEFAULT_CONNECTIONS
+        _redis = aioredis.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_max_connections,
+            **settings.redis_options(),
+        )
+    return _redis
+
+
+async def upload_cvs(request):
+    """Stream the uploads to spooled temp files and enqueue one parse job each."""
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > (
+        DEFAULT_LIMITS.max_request_bytes
+    ):
+        return JSONResponse({"error": "Request too large"}, status_code=413)
+    # Closing the form deletes the spooled files, also when enqueueing fails
+    async with request.form() as form:
+        files = form.getlist("files[]")
+        if not files:
+            return JSONResponse({"error": "No files provided"}, status_code=400)
+
+        jobs = []
+        queue = get_queue()
+        for file in files:
+            size = file.size
+            if size is None:
+                size = upload_size(file.file)
+            if size > DEFAULT_LIMITS.max_bytes:
+                jobs.append(
+                    {
+                        "job_id": None,
+                        "filename": file.filename,
+                        "error": "File too large",
+                    }
+                )
+                continue
+            file_content = await file.read()
+            job = await run_in_threadpool(
+                queue.enqueue,
+                "tasks.tasks.parse_cv",
+                file.filename,
+                file_content,
+                job_timeout=DEFAULT_LIMITS.job_timeout,
+            )
+            jobs.append({"job_id": job.id, "filename": file.filename})
+
+    return JSONResponse({"message": "Files uploaded successfully.", "jobs": jobs})
+
+
+async def job_status(request):
+    """Poll a job; unfinished jobs are answered from one async Redis read."""
+    job_id = request.path_params["job_id"]
+    status = await get_async_redis().hget(f"rq:job:{job_id}", "status")
+    if status is None:
+        return JSONResponse({"error": f"No such job: {job_id}"}, status_code=404)
+    if status.decode() not in FINAL_JOB_STATUSES:
+        return JSONResponse({"status": "in progress"}, status_code=202)
+    payload, status_code = await run_in_threadpool(job_status_payload, job_id)
+    return JSONResponse(payload, status_code=status_code)
+
+
+async def generate_cv(request):
+    """Search CVs with an async DB query and stream the matches back as a ZIP."""
+    form = await request.form()
+    skill = form.get("skill")
+    service = CVService(db)
+    try:
+        async with get_async_session() as session:
+            skill_id = None
+            if skill:
+                statement = service.canonical_skill_statement(skill)
+                skill_id = (await session.execute(statement)).scalar()
+            statement = service.search_statement(
+                form.get("job_title"),
+                form.get("company"),
+                form.get("years_of_experience"),
+                skill,
+                skill_id,
+            )
+            cvs = (await session.execute(statement)).scalars().unique().all()
+            if not cvs:
+                return JSONResponse(
+                    {"error": "No CVs found with the given criteria"}, status_code=404
+                )
+            statement = service.stored_outputs_statement(cv.path_of_cv for cv in cvs)
+            result = await session.execute(statement)
+            stored = {output.key: output for output in result.scalars()}
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=500)
+
+    entries = cv_zip_entries(cvs, stored)
+    if not entries:
+        return JSONResponse(
+            {"error": "No valid CV files found on the server"}, status_code=404
+        )
+
+    # Build the archive on disk off the event loop, stream it, then delete it
+    fd, zip_path = tempfile.mkstemp(suffix=".zip")
+    os.close(fd)
+    try:
+        await run_in_threadpool(zip_outputs, entries, zip_path)
+    except Exception as e:
+        os.remove(zip_path)
+        return JSONResponse({"error": str(e)}, status_code=500)
+    return FileResponse(
+        zip_path,
+        media_type="application/zip",
+        filename="matching_cvs.zip",
+        background=BackgroundTask(os.remove, zip_path),
+    )
+
+
+async def download_cv(request):
+    """Stream a filled CV from the output store, or redirect to its S3 URL."""
+    key = request.path_params["key"]
+    async with get_async_session() as session:
+        result = await session.execute(CVService.stored_outputs_statement([key]))
+        output = result.scalar()
+    if output is None:
+        return JSONResponse({"error": "File not found"}, status_code=404)
+    store = get_output_store()
+    url = await run_in_threadpool(store.url, key)
+    if url:
+        return RedirectResponse(url)
+    # FileResponse only finds a missing file once headers are being sent
+    path = store.local_path(key)
+    if not os.path.isfile(path):
+        return JSONResponse({"error": "File not found"}, status_code=404)
+    return FileResponse(path, media_type=output.content_type, filename=key)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    if _redis is not None:
+        await _redis.aclose()
+    if _engine is not None:
+        await _engine.dispose()
+
+
+application = Starlette(
+    routes=[
+        Route("/upload_cvs", upload_cvs, methods=["POST"]),
+        Route("/job_status/{job_id}", job_status, methods=["GET"]),
+        Route("/generate_cv", generate_cv, methods=["POST"]),
+        Route("/download/{key}", download_cv, methods=["GET"]),
+        Mount("/", app=WSGIMiddleware(flask_app)),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,72 @@
+import argparse
+import subprocess
+import sys
+
+# Modules the web tier and the CLI must not import just by being imported.
+HEAVY_MODULES = [
+    "spacy",
+    "thinc",
+    "numpy",
+    "pytesseract",
+    "PIL",
+    "PyPDF2",
+    "pdfplumber",
+    "docx",
+]
+
+ENTRY_POINTS = ["app", "cv_processor"]
+
+
+def profile_imports(module):
+    """Import ``module`` in a fresh interpreter; return ``{package: cumulative_us}``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        errors = [
+            line
+            for line in result.stderr.splitlines()
+            if not line.startswith("import time:")
+        ]
+        raise RuntimeError(f"Importing {module} failed:\n" + "\n".join(errors))
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def check(module, budget_ms=None):
+    """Return a list of problems with the import profile of ``module``."""
+    timings = profile_imports(module)
+    problems = []
+    roots = sorted(
+        {name.split(".")[0] for name in timings if name.split(".")[0] in HEAVY_MODULES}
+    )
+    if roots:
+        problems.append(f"{module} imports heavy modules: {', '.join(roots)}")
+    total_ms = timings.get(module, 0) / 1000
+    print(f"{module}: {total_ms:.1f} ms cumulative import time")
+    if budget_ms is not None and total_ms > budget_ms:
+        problems.append(f"{module} took {total_ms:.1f} ms (budget {budget_ms} ms)")
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Fail if the web tier or CLI import heavy dependencies at startup."
+    )
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--budget-ms", type=float, help="Max cumulative import time")
+    args = parser.parse_args()
+
+    problems = []
+    for module in args.modules:
+        problems.extend(check(module, args.budget_ms))
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,73 @@
+import os
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import DocBin
+
+DICTIONARIES_FOLDER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "dictionaries"
+)
+
+
+class Dictionary:
+    """A term list compiled once into a case-insensitive ``PhraseMatcher``.
+
+    Matching a document costs the same whatever the number of terms, and
+    exact membership checks go through a set. The tokenized patterns can be
+    cached as a ``DocBin`` so workers don't re-tokenize large taxonomies on
+    startup.
+    """
+
+    def __init__(self, nlp, label, terms=(), patterns=None):
+        self.label = label
+        if patterns is None:
+            patterns = list(nlp.tokenizer.pipe(terms))
+        self.patterns = patterns
+        self.terms = {pattern.text.lower() for pattern in patterns}
+        self.matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        self.matcher.add(label, patterns)
+
+    def __contains__(self, term):
+        return term.strip().lower() in self.terms
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __call__(self, doclike):
+        """Return ``(match_id, start, end)`` matches in a ``Doc`` or ``Span``."""
+        return self.matcher(doclike)
+
+    @staticmethod
+    def read_terms(path):
+        """Read one term per line, skipping blank lines and ``#`` comments."""
+        with open(path, encoding="utf-8") as file:
+            terms = [line.strip() for line in file]
+        return [term for term in terms if term and not term.startswith("#")]
+
+    @classmethod
+    def from_file(cls, nlp, label, path):
+        return cls(nlp, label, cls.read_terms(path))
+
+    def to_disk(self, path):
+        DocBin(attrs=["ORTH"], docs=self.patterns).to_disk(path)
+
+    @classmethod
+    def from_disk(cls, nlp, label, path):
+        patterns = list(DocBin().from_disk(path).get_docs(nlp.vocab))
+        return cls(nlp, label, patterns=patterns)
+
+
+def load_dictionary(nlp, name, folder=DICTIONARIES_FOLDER):
+    """Load ``<folder>/<name>.txt``, using the compiled ``.spacy`` cache when it is fresh."""
+    source = os.path.join(folder, f"{name}.txt")
+    cache = os.path.join(folder, f"{name}.spacy")
+    label = name.upper()
+    if os.path.isfile(cache) and os.path.getmtime(cache) >= os.path.getmtime(source):
+        try:
+            return Dictionary.from_disk(nlp, label, cache)
+        except Exception as e:
+            print(f"Error loading dictionary cache {cache}: {e}")
+    dictionary = Dictionary.from_file(nlp, label, source)
+    try:
+        dictionary.to_disk(cache)
+    except OSError as e:
+        print(f"Error writing dictionary cache {cache}: {e}")
+    return dictionary
@@ -0,0 +1,154 @@
+import re
+
+# Known section headings, keyed by the canonical section name.
+SECTION_HEADINGS = {
+    "summary": ["summary", "profile", "about me", "objective", "professional summary"],
+    "experience": [
+        "experience",
+        "work experience",
+        "professional experience",
+        "employment history",
+        "work history",
+        "الخبرات",
+    ],
+    "education": ["education", "academic background", "qualifications", "المؤهلات"],
+    "skills": [
+        "skills",
+        "soft skills",
+        "technical skills",
+        "programming languages",
+        "design patterns",
+        "المهارات",
+    ],
+    "certifications": [
+        "certifications",
+        "certificates",
+        "courses",
+        "licenses & certifications",
+        "الشهادات",
+    ],
+    "languages": ["languages", "اللغات"],
+}
+
+_HEADING_LOOKUP = {
+    heading: section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+
+# Headings are short lines; anything longer is body text.
+MAX_HEADING_LENGTH = 40
+
+
+def match_heading(line):
+    """Return the canonical section name if ``line`` looks like a section heading."""
+    line = line.strip()
+    if not line or len(line) > MAX_HEADING_LENGTH:
+        return None
+    normalized = re.sub(r"\s+", " ", line.rstrip(":").strip()).lower()
+    return _HEADING_LOOKUP.get(normalized)
+
+
+class Block:
+    """A run of text (paragraph, table cell or heading) with its offsets in the document text."""
+
+    __slots__ = ("kind", "text", "start", "end", "page", "section", "level")
+
+    def __init__(self, kind, text, start, end, page, section=None, level=None):
+        self.kind = kind
+        self.text = text
+        self.start = start
+        self.end = end
+        self.page = page
+        self.section = section
+        # Outline level of a heading (1 = top), when the source format has one
+        self.level = level
+
+    def __repr__(self):
+        return f"<Block {self.kind} page={self.page} [{self.start}:{self.end}] {self.text[:30]!r}>"
+
+
+class Page:
+    """A page of the source document and the blocks it contains."""
+
+    __slots__ = ("number", "start", "end", "blocks")
+
+    def __init__(self, number, start):
+        self.number = number
+        self.start = start
+        self.end = start
+        self.blocks = []
+
+
+class CVDocument:
+    """Lightweight structured view of an extracted CV.
+
+    Blocks are appended in reading order and joined into ``text`` with
+    newlines; pages are separated by a blank line. Every block keeps its
+    character offsets into ``text`` so spaCy spans can be mapped back.
+    """
+
+    def __init__(self):
+        self.pages = []
+        self._parts = []
+        self._length = 0
+
+    @property
+    def text(self):
+        return "".join(self._parts)
+
+    @property
+    def blocks(self):
+        return [block for page in self.pages for block in page.blocks]
+
+    @property
+    def headings(self):
+        return [block for block in self.blocks if block.kind == "heading"]
+
+    def _append(self, text):
+        self._parts.append(text)
+        self._length += len(text)
+
+    def add_page(self):
+        if self.pages:
+            self._append("\n\n")
+        page = Page(len(self.pages) + 1, self._length)
+        self.pages.append(page)
+        return page
+
+    def add_block(self, text, kind="paragraph", level=None):
+        """Append a block to the current page, detecting section headings."""
+        if not self.pages:
+            self.add_page()
+        page = self.pages[-1]
+        if page.blocks:
+            self._append("\n")
+        section = match_heading(text)
+        if section and kind == "paragraph":
+            kind = "heading"
+        start = self._length
+        self._append(text)
+        block = Block(kind, text, start, self._length, page.number, section, level)
+        page.blocks.append(block)
+        page.end = self._length
+        return block
+
+    def truncated(self, max_chars):
+        """Return a copy holding the whole blocks within ``max_chars`` characters.
+
+        Only a first block longer than ``max_chars`` on its own is cut, so the
+        copy is never empty when the document is not.
+        """
+        document = CVDocument()
+        for page in self.pages:
+            for index, block in enumerate(page.blocks):
+                if block.end > max_chars:
+                    if not document.pages:
+                        document.add_block(
+                            block.text[:max_chars], block.kind, block.level
+                        )
+                    return document
+                if index == 0:
+                    document.add_page()
+                document.add_block(block.text, block.kind, block.level)
+        return document
@@ -1,54 +1,274 @@
 import os
-import pytesseract
-from PIL import Image
-import PyPDF2
-import pdfplumber
-from docx import Document
+import time
+from cv_document import CVDocument
+from processing_limits import DEFAULT_LIMITS, InputTooLarge
+
+# The OCR, PDF and DOCX backends are imported inside the extractors that use
+# them, so importing this module (or handling one format) stays cheap.
+
+# Leading bytes used to identify the real format of an upload, regardless of
+# what its extension claims.
+MAGIC_NUMBERS = [
+    (b"%PDF-", "pdf"),
+    (b"PK\x03\x04", "docx"),
+    (b"\xff\xd8\xff", "image"),
+    (b"\x89PNG\r\n\x1a\n", "image"),
+]
+
+EXTENSION_FORMATS = {
+    ".jpg": "image",
+    ".jpeg": "image",
+    ".png": "image",
+    ".pdf": "pdf",
+    ".docx": "docx",
+}
+
+# Resolution used when a PDF page has to be rasterised for OCR.
+OCR_RESOLUTION = 300
+
 
 class CVHandler:
     """Handles text extraction from different CV file types."""
     @staticmethod
-    def extract_text(file_path):
-        extension = os.path.splitext(file_path)[1].lower()
-        print(extension)
-        if extension in [".jpg", ".jpeg", ".png"]:
-            return CVHandler._extract_from_image(file_path)
-        elif extension == ".pdf":
-            return CVHandler._extract_from_pdf(file_path)
-        elif extension == ".docx":
-            return CVHandler._extract_from_docx(file_path)
+    def extract_text(file_path, report=None, limits=None):
+        """Extract the plain text of a CV file."""
+        return CVHandler.extract_document(file_path, report, limits).text
+
+    @staticmethod
+    def extract_document(file_path, report=None, limits=None, deadline=None):
+        """Extract a CV file into a structured ``CVDocument``.
+
+        If ``report`` is a dict it is filled with the detected format, the
+        extractor chosen for each page and the budgets of ``limits`` that
+        truncated the result, so callers can record the decision. Callers
+        extracting several files under one time budget pass a shared
+        ``deadline``; by default each file gets ``limits.max_seconds``.
+        """
+        limits = limits or DEFAULT_LIMITS
+        if report is None:
+            report = {}
+        report["pages"] = []
+        report["truncated"] = []
+        size = os.path.getsize(file_path)
+        if size > limits.max_bytes:
+            report["rejected"] = "max_bytes"
+            raise InputTooLarge(
+                f"File is too large: {size} bytes (max {limits.max_bytes})"
+            )
+        if deadline is None:
+            deadline = limits.deadline()
+        file_format = CVHandler.detect_format(file_path)
+        report["format"] = file_format
+        document = CVDocument()
+        if file_format == "image":
+            report["pages"].append("ocr")
+            text = CVHandler._extract_from_image(file_path, limits, deadline, report)
+            CVHandler._add_page_text(document, text)
+        elif file_format == "pdf":
+            CVHandler._extract_from_pdf(file_path, document, report, limits, deadline)
+        elif file_format == "docx":
+            report["pages"].append("docx")
+            CVHandler._extract_from_docx(file_path, document)
         else:
+            extension = os.path.splitext(file_path)[1].lower()
             raise ValueError(f"Unsupported file type: {extension}")
+        if len(document.text) > limits.max_chars:
+            report["truncated"].append("max_chars")
+            document = document.truncated(limits.max_chars)
+        return document
+
+    @staticmethod
+    def detect_format(file_path):
+        """Detect the file format from its magic bytes, falling back to the extension."""
+        try:
+            with open(file_path, "rb") as file:
+                header = file.read(8)
+        except OSError as e:
+            print(f"Error reading file header: {e}")
+            header = b""
+        for magic, file_format in MAGIC_NUMBERS:
+            if header.startswith(magic):
+                return file_format
+        extension = os.path.splitext(file_path)[1].lower()
+        return EXTENSION_FORMATS.get(extension)
+
+    @staticmethod
+    def _add_page_text(document, text):
+        """Add a page of flat extracted text, one block per non-empty line."""
+        document.add_page()
+        for line in text.splitlines():
+            if line.strip():
+                document.add_block(line.strip())
+
+    @staticmethod
+    def _ocr(image, timeout, report=None):
+        """OCR an image; a timeout is recorded as ``ocr_timeout`` in ``report``."""
+        import pytesseract
+
+        try:
+            return pytesseract.image_to_string(image, timeout=timeout)
+        except RuntimeError as e:
+            # pytesseract kills tesseract and raises RuntimeError on timeout
+            print(f"OCR timed out: {e}")
+            if report is not None:
+                truncated = report.setdefault("truncated", [])
+                if "ocr_timeout" not in truncated:
+                    truncated.append("ocr_timeout")
+            return ""
 
     @staticmethod
-    def _extract_from_image(file_path):
+    def _extract_from_image(
+        file_path, limits=DEFAULT_LIMITS, deadline=None, report=None
+    ):
+        from PIL import Image
+
+        if deadline is None:
+            deadline = limits.deadline()
         try:
-            return pytesseract.image_to_string(Image.open(file_path))
+            image = Image.open(file_path)
+            # Downscale huge images; OCR time grows with the pixel count.
+            pixels = image.width * image.height
+            if pixels > limits.max_image_pixels:
+                scale = (limits.max_image_pixels / pixels) ** 0.5
+                image.thumbnail((int(image.width * scale), int(image.height * scale)))
+            return CVHandler._ocr(image, limits.ocr_timeout_before(deadline), report)
         except Exception as e:
             print(f"Error extracting text from image: {e}")
             return ""
 
     @staticmethod
-    def _extract_from_pdf(file_path):
+    def _extract_from_pdf(
+        file_path, document, report=None, limits=DEFAULT_LIMITS, deadline=None
+    ):
+        """Extract text page by page, using the cheapest extractor that works.
+
+        PyPDF2 is tried first on every page (text drawn through form XObjects
+        included), pdfplumber is used when PyPDF2 returns nothing, and OCR only
+        runs on pages that still have no text (e.g. scanned pages). Extraction stops at
+        ``limits.max_pages`` or when ``deadline`` has passed.
+        """
+        import PyPDF2
+        import pdfplumber
+
+        if report is None:
+            report = {"pages": []}
+        report.setdefault("pages", [])
+        report.setdefault("truncated", [])
+        if deadline is None:
+            deadline = limits.deadline()
+        plumber_pdf = None
         try:
             with open(file_path, "rb") as file:
                 reader = PyPDF2.PdfReader(file)
-                text = "".join([page.extract_text() for page in reader.pages])
-            return text
+                texts = []
+                for index, page in enumerate(reader.pages):
+                    if index >= limits.max_pages:
+                        report["truncated"].append("max_pages")
+                        break
+                    if time.monotonic() > deadline:
+                        report["truncated"].append("max_seconds")
+                        break
+                    text = ""
+                    try:
+                        text = page.extract_text() or ""
+                    except Exception as e:
+                        print(f"Error extracting text from PDF page (PyPDF2): {e}")
+                    method = "pypdf2"
+                    if not text.strip():
+                        if plumber_pdf is None:
+                            plumber_pdf = pdfplumber.open(file_path)
+                        text = CVHandler._extract_page_with_pdfplumber(
+                            plumber_pdf, index
+                        )
+                        method = "pdfplumber"
+                    if not text.strip():
+                        if plumber_pdf is None:
+                            plumber_pdf = pdfplumber.open(file_path)
+                        text = CVHandler._ocr_pdf_page(
+                            plumber_pdf,
+                            index,
+                            limits.ocr_timeout_before(deadline),
+                            report,
+                        )
+                        method = "ocr"
+                    report["pages"].append(method)
+                    texts.append(text)
+            for text in texts:
+                CVHandler._add_page_text(document, text)
         except Exception as e:
             print(f"Error extracting text from PDF (PyPDF2): {e}")
+            report["pages"] = []
             try:
-                with pdfplumber.open(file_path) as pdf:
-                    return "".join([page.extract_text() for page in pdf.pages])
+                if plumber_pdf is None:
+                    plumber_pdf = pdfplumber.open(file_path)
+                for index, page in enumerate(plumber_pdf.pages):
+                    if index >= limits.max_pages:
+                        report["truncated"].append("max_pages")
+                        break
+                    if time.monotonic() > deadline:
+                        report["truncated"].append("max_seconds")
+                        break
+                    CVHandler._add_page_text(document, page.extract_text() or "")
+                    report["pages"].append("pdfplumber")
             except Exception as fallback_error:
                 print(f"Error extracting text from PDF (pdfplumber): {fallback_error}")
-                return ""
+        finally:
+            if plumber_pdf is not None:
+                plumber_pdf.close()
+        return document
+
+    @staticmethod
+    def _extract_page_with_pdfplumber(pdf, index):
+        try:
+            return pdf.pages[index].extract_text() or ""
+        except Exception as e:
+            print(f"Error extracting text from PDF page (pdfplumber): {e}")
+            return ""
 
     @staticmethod
-    def _extract_from_docx(file_path):
+    def _ocr_pdf_page(pdf, index, timeout=0, report=None):
+        try:
+            image = pdf.pages[index].to_image(resolution=OCR_RESOLUTION).original
+            return CVHandler._ocr(image, timeout, report)
+        except Exception as e:
+            print(f"Error extracting text from PDF page (OCR): {e}")
+            return ""
+
+    @staticmethod
+    def _extract_from_docx(file_path, document):
+        """Extract paragraphs and table cells from a Word document, in body order."""
+        from docx import Document
+        from docx.table import Table
+        from docx.text.paragraph import Paragraph
+
         try:
             doc = Document(file_path)
-            return "\n".join([para.text for para in doc.paragraphs])
+            document.add_page()
+            for element in doc.element.body.iterchildren():
+                tag = element.tag.rsplit("}", 1)[-1]
+                if tag == "p":
+                    paragraph = Paragraph(element, doc)
+                    if not paragraph.text.strip():
+                        continue
+                    style = paragraph.style.name if paragraph.style is not None else ""
+                    if style.startswith("Heading"):
+                        level = style[len("Heading") :].strip()
+                        document.add_block(
+                            paragraph.text.strip(),
+                            "heading",
+                            int(level) if level.isdigit() else 1,
+                        )
+                    else:
+                        document.add_block(paragraph.text.strip())
+                elif tag == "tbl":
+                    seen = set()
+                    for row in Table(element, doc).rows:
+                        for cell in row.cells:
+                            # Merged cells are returned once per grid position.
+                            if id(cell._tc) in seen or not cell.text.strip():
+                                continue
+                            seen.add(id(cell._tc))
+                            document.add_block(cell.text.strip(), "table_cell")
         except Exception as e:
             print(f"Error extracting text from Word document: {e}")
-            return ""
+        return document
@@ -1,156 +1,75 @@
+import os
 import spacy
 import re
-from spacy.matcher import Matcher, PhraseMatcher
+from cv_dictionaries import load_dictionary
+from cv_document import CVDocument
+from cv_segmenter import SectionSegmenter
+from skill_index import SKILLS_NOT_FOUND
+
+# Pipeline used as the parser engine: a spaCy package name or a model directory,
+# e.g. the CV-specific model produced by train_model.py ("training/model-best").
+DEFAULT_MODEL = os.environ.get("CV_PARSER_MODEL", "en_core_web_md")
+
+# Entity labels of the generic English pipelines and of the CV-specific model.
+PERSON_LABELS = {"PERSON", "PERSON_NAME"}
+ORG_LABELS = {"ORG", "ORGANIZATION"}
+LOCATION_LABELS = {"GPE", "ADDRESS"}
+ROLE_LABELS = {"PERSON", "TITLE", "JOB_TITLE"}
+SKILL_LABELS = {"SKILL"}
 
 
 class CVParser:
     """Parses CV text to extract structured data."""
 
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_md")
+    def __init__(self, model=None, disable=()):
+        self.nlp = spacy.load(model or DEFAULT_MODEL, disable=list(disable))
+        # The trained CV model only has tok2vec + ner, so it needs sentence
+        # boundaries from somewhere.
+        if not any(
+            self.nlp.has_pipe(name) for name in ("parser", "senter", "sentencizer")
+        ):
+            self.nlp.add_pipe("sentencizer")
         self.languages_list = ["Arabic", "English", "French", "Spanish", "German"]
-        self.skills_list = [
-            "Python",
-            "Java",
-            "SQL",
-            "Testing",
-            "Leadership",
-            "Django",
-            "Machine Learning",
-            "Flutter",
-        ]
-        self.skills_matcher = PhraseMatcher(self.nlp.vocab)
-        patterns = [self.nlp.make_doc(skill) for skill in self.skills_list]
-        self.skills_matcher.add("SKILLS", None, *patterns)
-        self.common_roles = {
-            "Manager",
-            "Team Leader",
-            "Supervisor",
-            "Consultant",
-            "Analyst",
-            "Accountant",
-            "Auditor",
-            "Engineer",
-            "Developer",
-            "Designer",
-            "Teacher",
-            "Marketer",
-            "Specialist",
-            "Coordinator",
-            "Administrator",
-            "Technician",
-        }
-
-        self.location_keywords = {
-            "New York",
-            "London",
-            "Cairo",
-            "San Francisco",
-            "Paris",
-            "Germany",
-            "USA",
-            "Canada",
-            "India",
-            "California",
-            "Egypt",
-            "Dubai",
-            "Tokyo",
-            "Japan",
-            "Australia",
-            "Ireland",
-            "Singapore",
-            "Brazil",
-            "France",
-            "Mexico",
-            "Italy",
-            "South Africa",
-            "Russia",
-            "China",
-            "Korea",
-            "Turkey",
-            "Indonesia",
-            "Pakistan",
-            "Bangladesh",
-            "Vietnam",
-            "Philippines",
-            "Taiwan",
-            "Austria",
-            "Netherlands",
-            "Sweden",
-            "Belgium",
-            "Finland",
-            "Norway",
-            "Switzerland",
-            "Denmark",
-            "Iceland",
-            "Greece",
-            "Portugal",
-            "Spain",
-            "Ireland",
-            "United Kingdom",
-            "Germany",
-            "France",
-            "Italy",
-            "Netherlands",
-            "Belgium",
-            "Finland",
-            "Norway",
-            "Sweden",
-            "Denmark",
-            "Iceland",
-            "Greece",
-            "Portugal",
-            "Spain",
-            "United Kingdom",
-            "Germany",
-            "France",
-            "Italy",
-            "Netherlands",
-            "Belgium",
-            "Finland",
-            "Norway",
-            "Sweden",
-            "Denmark",
-            "Cairo",
-            "Alexandria",
-            "Mansoura",
-            "riyadh",
-            "Jiddah",
-            "Makkah",
-            "Saudi Arabia",
-            "Tawuniya",
-            "High School",
-            "Languages" "Experience",
-            "Education",
-            "Page 1 of 1",
-            "Page 2 of 2",
-            "Page 3 of 3",
-            "Page 4 of 4",
-            "Page 5 of 5",
-            "Page 6 of 6",
-            "Riyadh",
-            "bachelor of",
-            "university",
-            "Bachelor’s Degree",
-            "Certifications",
-            "Experience",
-            "Summary",
-            # Add more location keywords as necessary
-        }
+        # Term dictionaries are loaded from dictionaries/*.txt and compiled once
+        self.skills_matcher = load_dictionary(self.nlp, "skills")
+        self.common_roles = load_dictionary(self.nlp, "roles")
+        self.location_keywords = load_dictionary(self.nlp, "locations")
+        self.segmenter = SectionSegmenter()
 
     def parse(self, cv_text):
-        """Extract structured data."""
+        """Extract structured data from plain text or a ``CVDocument``."""
+        layout = None
+        if isinstance(cv_text, CVDocument):
+            layout = cv_text
+            cv_text = layout.text
         doc = self.nlp(cv_text)
+        return self._extract(doc, layout)
+
+    def parse_many(self, cv_texts, batch_size=8):
+        """Parse several texts or ``CVDocument``s, batched through ``nlp.pipe``."""
+        layouts = [text if isinstance(text, CVDocument) else None for text in cv_texts]
+        texts = [
+            layout.text if layout is not None else text
+            for text, layout in zip(cv_texts, layouts)
+        ]
+        docs = self.nlp.pipe(texts, batch_size=batch_size)
+        return [self._extract(doc, layout) for doc, layout in zip(docs, layouts)]
+
+    def _extract(self, doc, layout=None):
+        """Run every field extractor over an analysed ``doc``."""
+        # Label the section regions once; each extractor only gets its slice
+        sections = self.segmenter.segment(doc.text, layout)
+        experience = self.extract_experience(doc, sections)
         data = {
             "name": self.extract_name(doc),
             "contact": self.extract_contact(doc),
-            "position": self.extract_position(doc),
-            "years_of_experience": self.extract_years_of_experience(doc),
-            "education": self.extract_education(doc),
-            "certificates": self.extract_certificates(doc),
+            "position": self.extract_position(doc, experience),
+            "years_of_experience": self.extract_years_of_experience(doc, sections),
+            "education": self.extract_education(doc, sections),
+            "certificates": self.extract_certificates(doc, sections),
             "languages": self.extract_languages(doc),
-            "skills": self.extract_skills(doc),
-            "experience": self.extract_experience(doc),
+            "skills": self.extract_skills(doc, sections),
+            "experience": experience,
             "contact": self.extract_contact(doc),
         }
         return data
@@ -158,7 +77,7 @@ class CVParser:
     def extract_name(self, doc):
         """Extract the name by identifying the first PERSON entity."""
         for ent in doc.ents:
-            if ent.label_ == "PERSON":
+            if ent.label_ in PERSON_LABELS:
                 return ent.text
         # Fallback: Look for "Summary" or similar labels as hints
         summary_match = re.search(r"(Summary|Name):\s*(.+)", doc.text, re.IGNORECASE)
@@ -184,14 +103,30 @@ class CVParser:
 
         return contact
 
-    def extract_years_of_experience(self, doc):
-        for sent in doc.sents:
+    def _section_sents(self, doc, sections, *names):
+        """Sentences of the named sections, or None when the CV has none of them."""
+        spans = self.segmenter.section_spans(doc, sections or {}, *names)
+        if not spans:
+            return None
+        # Span.sents yields whole sentences, which may run past the section
+        return [
+            doc[max(sent.start, span.start) : min(sent.end, span.end)]
+            for span in spans
+            for sent in span.sents
+        ]
+
+    def extract_years_of_experience(self, doc, sections=None):
+        sents = self._section_sents(doc, sections, "summary", "experience")
+        for sent in sents or doc.sents:
             match = re.search(r"(\d+)\s+(years|سنوات)", sent.text.lower())
             if match:
                 return match.group(1)
         return 0
 
-    def extract_education(self, doc):
+    def extract_education(self, doc, sections=None):
+        sents = self._section_sents(doc, sections, "education")
+        if sents:
+            return "\n".join(sent.text.strip() for sent in sents if sent.text.strip())
         education = []
         for sent in doc.sents:
             if any(
@@ -201,7 +136,10 @@ class CVParser:
                 education.append(sent.text.strip())
         return "\n".join(education)
 
-    def extract_certificates(self, doc):
+    def extract_certificates(self, doc, sections=None):
+        sents = self._section_sents(doc, sections, "certifications")
+        if sents:
+            return "\n".join(sent.text.strip() for sent in sents if sent.text.strip())
         certificates = []
         for sent in doc.sents:
             if any(
@@ -276,12 +214,26 @@ class CVParser:
         # Ensure all items in `skills` are strings before joining
         return ", ".join(map(str, sorted(skills))) if skills else "Skills not found" """
 
-    def extract_skills(self, doc):
+    def extract_skills(self, doc, sections=None):
         skills = set()
 
+        # When the skills sections are known, only look there
+        spans = self.segmenter.section_spans(doc, sections or {}, "skills")
+        if spans:
+            for span in spans:
+                matches = self.skills_matcher(span)
+                # Matches on a span are indexed relative to the whole doc
+                skills.update([doc[start:end].text for _, start, end in matches])
+                skills.update(
+                    ent.text for ent in span.ents if ent.label_ in SKILL_LABELS
+                )
+            contents = [span.text for span in spans]
+            return self._collect_skills(contents, skills)
+
         # Match phrases using the PhraseMatcher
         matches = self.skills_matcher(doc)
         skills.update([doc[start:end].text for _, start, end in matches])
+        skills.update(ent.text for ent in doc.ents if ent.label_ in SKILL_LABELS)
 
         # Regex for extracting common skill sections
         skill_sections = [
@@ -295,6 +247,10 @@ class CVParser:
             r"(?i)(" + "|".join(skill_sections) + r")\s*:?(.+?)(\n\s*\n|$)"
         )
         matches = re.findall(section_pattern, doc.text, re.DOTALL)
+        return self._collect_skills([content for _, content, _ in matches], skills)
+
+    def _collect_skills(self, contents, skills):
+        """Split skill section contents into individual skills, dropping dates and locations."""
         date_pattern = re.compile(
             r"(?i)(\b(january|february|march|april|may|june|july|august|september|october|november|december)\b\s*\d{4}"
             r"(\s*[-–]\s*(\b(january|february|march|april|may|june|july|august|september|october|november|december)\b\s*\d{4})?)?"
@@ -303,11 +259,13 @@ class CVParser:
 
         # Common locations or location-like terms to exclude
 
-        for _, content, _ in matches:
+        for content in contents:
             # Extract comma-separated or space-separated terms
             extracted_skills = re.split(r"[,\n]", content)
             for skill in extracted_skills:
                 skill = skill.strip()
+                if not skill:
+                    continue
                 # Skip skills resembling dates
                 if re.match(
                     r"\b(\d{2}/\d{4}|\d{4}[-–]\d{4}|\d{4})\b", skill
@@ -322,7 +280,7 @@ class CVParser:
                 skills.add(skill)
 
         # Ensure all items in `skills` are strings before joining
-        return ", ".join(map(str, sorted(skills))) if skills else "Skills not found"
+        return ", ".join(map(str, sorted(skills))) if skills else SKILLS_NOT_FOUND
 
     """ def extract_experience(self, doc):
         experience = []
@@ -357,19 +315,22 @@ class CVParser:
 
         return experience """
 
-    def extract_experience(self, doc):
-        self.nlp = spacy.load("en_core_web_md")
-        # Common roles across professions
-
+    def extract_experience(self, doc, sections=None):
         experience = []
 
         date_pattern = r"(\d{2}/\d{4}|\d{4}–\d{4}|\d{4}-\d{4}|\d{4})"
 
+        # Only the experience section is split, when the CV has one
+        spans = self.segmenter.section_spans(doc, sections or {}, "experience")
+        text = "\n".join(span.text for span in spans) if spans else doc.text
+
         # Split text by date patterns
-        chunks = re.split(date_pattern, doc.text)
-        for i in range(1, len(chunks), 2):  # Process pairs of date and related text
+        chunks = re.split(date_pattern, text)
+        related_texts = [chunks[i + 1].strip() for i in range(1, len(chunks), 2)]
+        related_docs = self.nlp.pipe(related_texts)
+        for i, related_doc in zip(range(1, len(chunks), 2), related_docs):
             dates = chunks[i].strip()
-            related_text = chunks[i + 1].strip()
+            related_text = related_doc.text
 
             experience_entry = {
                 "dates": dates,
@@ -379,24 +340,29 @@ class CVParser:
                 "description": None,
             }
 
-            # Process the related text with SpaCy
-            related_doc = self.nlp(related_text)
-
             # Extract entities dynamically
             for ent in related_doc.ents:
-                if ent.label_ == "ORG" and not experience_entry["company"]:
+                if ent.label_ in ORG_LABELS and not experience_entry["company"]:
                     experience_entry["company"] = ent.text
-                elif ent.label_ == "GPE" and not experience_entry["location"]:
+                elif (
+                    ent.label_ in LOCATION_LABELS and not experience_entry["location"]
+                ):
                     experience_entry["location"] = ent.text
-                elif ent.label_ in {"PERSON", "TITLE"} and not experience_entry["role"]:
+                elif ent.label_ in ROLE_LABELS and not experience_entry["role"]:
                     # Use title-like entities as roles
                     experience_entry["role"] = ent.text
 
+            # Lines holding a known role, found in one pass over the chunk
+            role_lines = {
+                related_text.count("\n", 0, related_doc[start].idx)
+                for _, start, _ in self.common_roles(related_doc)
+            }
+
             # Infer roles and descriptions heuristically
             lines = related_text.split("\n")
-            for line in lines:
+            for index, line in enumerate(lines):
                 # Check for a role using a broader list and heuristic patterns
-                if any(role.lower() in line.lower() for role in self.common_roles):
+                if index in role_lines:
                     experience_entry["role"] = line.strip()
                 elif (
                     any(word.istitle() for word in line.split())
@@ -418,9 +384,10 @@ class CVParser:
 
         return experience
 
-    def extract_position(self, doc):
+    def extract_position(self, doc, experiences=None):
         """Extract the first role from the experience section."""
-        experiences = self.extract_experience(doc)  # Use the parsed experience data
+        if experiences is None:
+            experiences = self.extract_experience(doc)  # Use the parsed experience data
         if experiences and "role" in experiences[0]:
             return experiences[0]["role"]  # Return the first role found
         return "Position not found"
@@ -1,21 +1,35 @@
 import sys
 from cv_handler import CVHandler
-from cv_parser import CVParser
-from docx import Document
 import os  # Add this line
 
 class CVProcessor:
     """Central dispatcher for processing CVs."""
-    def __init__(self):
-        self.parser = CVParser()
+    def __init__(self, limits=None):
+        from cv_parser import CVParser  # Loads spaCy, only once a processor is built
 
-    def process(self, file_path):
+        self.parser = CVParser()
+        self.limits = limits
+        # Extraction decision (format, per-page extractor, truncation) of the last file
+        self.last_extraction = {}
+
+    def extract(self, file_path):
+        """Extract the structured document, recording the extraction decision."""
+        self.last_extraction = {}
+        document = CVHandler.extract_document(
+            file_path, report=self.last_extraction, limits=self.limits
+        )
+        print(f"Extraction: {self.last_extraction}")
+        return document
+
+    def process(self, file_path, document=None):
+        """Parse a CV file; pass ``document`` when it was already extracted."""
         try:
-            cv_text = CVHandler.extract_text(file_path)
-            if not cv_text.strip():
+            if document is None:
+                document = self.extract(file_path)
+            if not document.text.strip():
                 print("No text extracted from the file.")
                 return None
-            return self.parser.parse(cv_text)
+            return self.parser.parse(document)
         except Exception as e:
             print(f"Error processing CV: {e}")
             return None
@@ -23,6 +37,8 @@ class CVProcessor:
     @staticmethod
     def fill_template(parsed_data, template_path, output_path):
         """Fill a Word template with parsed CV data."""
+        from docx import Document
+
         try:
             # Ensure the template exists
             if not os.path.isfile(template_path):
@@ -0,0 +1,77 @@
+import re
+from cv_document import match_heading
+
+# "Skills: Python, SQL" style lines, where the heading and content share a line.
+INLINE_HEADING_PATTERN = re.compile(r"^\s*([^:\n]{1,40}):\s*\S")
+
+
+class SectionSegmenter:
+    """Labels the section regions of a CV (Experience, Education, Skills, ...).
+
+    Rule based: a region starts at a recognised heading and runs until the
+    next recognised heading. Headings are found by scanning the text line by
+    line, and when the extractor produced a ``CVDocument`` its headings are
+    used too. A layout heading that names no known section (a job title
+    styled "Heading 2", a "Projects" heading) only ends the current section
+    when its outline level is the same as or above the section's own.
+    """
+
+    def segment(self, text, layout=None):
+        """Return ``{section: [(start, end), ...]}`` character spans of ``text``."""
+        boundaries = {
+            start: (name, start, end, None)
+            for name, start, end in self._find_headings(text)
+        }
+        if layout is not None:
+            for heading in layout.headings:
+                name = heading.section or boundaries.get(heading.start, (None,))[0]
+                boundaries[heading.start] = (
+                    name,
+                    heading.start,
+                    heading.end,
+                    heading.level,
+                )
+
+        sections = {}
+        current = None  # (name, content_start, level) of the open section
+        for start in sorted(boundaries) + [len(text)]:
+            name, _, content_start, level = boundaries.get(
+                start, (None, start, start, None)
+            )
+            closes = start == len(text) or name is not None
+            if not closes and current is not None:
+                closes = None not in (level, current[2]) and level <= current[2]
+            if not closes:
+                continue
+            if current is not None and text[current[1] : start].strip():
+                sections.setdefault(current[0], []).append((current[1], start))
+            current = (name, content_start, level) if name else None
+        return sections
+
+    def _find_headings(self, text):
+        """Find ``(section, heading_start, content_start)`` for each heading line."""
+        boundaries = []
+        offset = 0
+        for line in text.split("\n"):
+            section = match_heading(line)
+            if section:
+                boundaries.append((section, offset, offset + len(line)))
+            else:
+                inline = INLINE_HEADING_PATTERN.match(line)
+                if inline and match_heading(inline.group(1)):
+                    boundaries.append(
+                        (match_heading(inline.group(1)), offset, offset + inline.end(1) + 1)
+                    )
+            offset += len(line) + 1
+        return boundaries
+
+    def section_spans(self, doc, sections, *names):
+        """Map the named section offsets onto spaCy spans of ``doc``."""
+        spans = []
+        for name in names:
+            for start, end in sections.get(name, []):
+                span = doc.char_span(start, end, alignment_mode="expand")
+                if span is not None and span.text.strip():
+                    spans.append(span)
+        spans.sort(key=lambda span: span.start)
+        return spans
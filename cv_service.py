@@ -1,14 +1,59 @@
-from models import Certificates, Skills, CV, Experiences
+from models import CanonicalSkill, Certificates, Skills, CV, CVFingerprint, Experiences
+from models import StoredOutput
+from near_duplicates import (
+    DUPLICATE_THRESHOLD,
+    estimate_similarity,
+    lsh_buckets,
+    minhash_signature,
+    signature_from_bytes,
+    signature_to_bytes,
+)
+from skill_index import SKILLS_NOT_FOUND, get_skill_index, skill_names
+from sqlalchemy import delete, exists, select
+from sqlalchemy.exc import IntegrityError
+from models import cv_skills
 import re
 
 
 class CVService:
     def __init__(self, db):
         self.db = db
+        self.skill_index = get_skill_index()
 
-    def save_cv(self, parsed_data):
-        """Save parsed data into the database."""
-        print(parsed_data)
+    def find_duplicate(self, cv_text):
+        """Return ``(cv_id, signature)``; cv_id is set when a near-duplicate CV exists.
+
+        Candidates come from an indexed lookup of the LSH band buckets, and
+        only those are compared on their full MinHash signature. A match that
+        is itself a duplicate resolves to its original, so ``cv_id`` is never
+        a duplicate.
+        """
+        signature = minhash_signature(cv_text)
+        if signature is None:
+            return None, None
+        candidates = (
+            CV.query.join(CVFingerprint)
+            .filter(CVFingerprint.bucket.in_(lsh_buckets(signature)))
+            .filter(CV.minhash.isnot(None))
+            .distinct()
+            .all()
+        )
+        best_id, best_score = None, DUPLICATE_THRESHOLD
+        for candidate in candidates:
+            score = estimate_similarity(
+                signature, signature_from_bytes(candidate.minhash)
+            )
+            if score >= best_score:
+                best_id, best_score = candidate.duplicate_of or candidate.id, score
+        return best_id, signature
+
+    def save_cv(self, parsed_data, signature=None, output=None, duplicate_of=None):
+        """Save parsed data into the database.
+
+        ``output`` is the ``ObjectInfo`` of the filled CV in the output store;
+        ``duplicate_of`` is the id ``find_duplicate`` matched, if any.
+        """
+        print(f"Saving CV: {parsed_data.get('name')} ({parsed_data.get('position')})")
         phone = parsed_data.get("contact", {}).get("phone", None)
         email = parsed_data.get("contact", {}).get("email", None)
 
@@ -24,10 +69,19 @@ class CVService:
             years_of_experience=parsed_data["years_of_experience"],
             phone=phone,
             email=email,
+            minhash=signature_to_bytes(signature) if signature is not None else None,
+            duplicate_of=duplicate_of,
         )
         self.db.session.add(cv)
+        if output is not None:
+            self.add_stored_output(output)
         self.db.session.flush()  # Get the ID for CV
 
+        # Index the signature so later near-duplicates of this CV are found
+        if signature is not None:
+            for bucket in set(lsh_buckets(signature)):
+                self.db.session.add(CVFingerprint(cv_id=cv.id, bucket=bucket))
+
         # Insert certificates
         for cert in parsed_data["certificates"].split("\n"):
             if cert:
@@ -35,10 +89,11 @@ class CVService:
                 self.db.session.add(certificate)
 
         # Insert skills
-        for skill in parsed_data["skills"].split(","):
-            if skill:
-                skill_entry = Skills(cv_id=cv.id, name=skill.strip())
-                self.db.session.add(skill_entry)
+        skills = skill_names(parsed_data["skills"])
+        for skill in skills:
+            skill_entry = Skills(cv_id=cv.id, name=skill)
+            self.db.session.add(skill_entry)
+        self.link_canonical_skills(cv, skills)
         for experience in parsed_data["experience"]:
             truncated_description = (experience.get("description") or "")[:255] or None
 
@@ -54,6 +109,184 @@ class CVService:
         self.db.session.commit()
         return cv.id
 
+    def link_canonical_skills(self, cv, skills):
+        """Replace the canonical skill links of ``cv`` with those of ``skills``."""
+        self.db.session.execute(cv_skills.delete().where(cv_skills.c.cv_id == cv.id))
+        canonical_ids = set()
+        for skill in skills:
+            if skill.strip() and skill.strip() != SKILLS_NOT_FOUND:
+                canonical = self.get_or_create_canonical_skill(skill)
+                if canonical.id not in canonical_ids:
+                    canonical_ids.add(canonical.id)
+                    cv.canonical_skills.append(canonical)
+
+    def add_stored_output(self, output):
+        """Add the catalog row of a stored object; identical outputs share one row."""
+        if self.db.session.get(StoredOutput, output.key) is not None:
+            return
+        try:
+            # In a savepoint, so losing an insert race keeps the outer transaction
+            with self.db.session.begin_nested():
+                self.db.session.add(
+                    StoredOutput(
+                        key=output.key,
+                        size=output.size,
+                        content_type=output.content_type,
+                    )
+                )
+        except IntegrityError:
+            # Another worker stored the same document first; its row is identical
+            pass
+
+    def get_or_create_canonical_skill(self, skill):
+        """Return the canonical skill row for a skill surface form."""
+        key, name = self.skill_index.canonicalize(skill)
+        canonical = CanonicalSkill.query.filter_by(key=key).first()
+        if canonical:
+            return canonical
+        try:
+            # In a savepoint, so losing an insert race keeps the outer transaction
+            with self.db.session.begin_nested():
+                canonical = CanonicalSkill(key=key, name=name)
+                self.db.session.add(canonical)
+        except IntegrityError:
+            # Another worker added it first; a locking read sees its committed row
+            canonical = (
+                CanonicalSkill.query.filter_by(key=key).with_for_update(read=True).one()
+            )
+        return canonical
+
+    @staticmethod
+    def embedding_data(cv):
+        """A stored CV in the shape ``vector_index.cv_embedding_text`` expects."""
+        return {
+            "position": cv.job_title,
+            "skills": ", ".join(skill.name for skill in cv.skills),
+            "experience": [
+                {
+                    "role": experience.role,
+                    "company": experience.company,
+                    "description": experience.description,
+                }
+                for experience in cv.experiences
+            ],
+        }
+
+    def backfill_vector_index(self, index, embedder, batch_size=500):
+        """Add stored CVs missing from the vector index; returns how many were added.
+
+        Near-duplicates are left out, like at ingest.
+        """
+        from vector_index import cv_embedding_text
+
+        indexed = index.indexed_ids()
+        count, last_id = 0, 0
+        while True:
+            cvs = (
+                CV.query.filter(CV.id > last_id).order_by(CV.id).limit(batch_size).all()
+            )
+            if not cvs:
+                break
+            for cv in cvs:
+                if cv.id not in indexed and cv.duplicate_of is None:
+                    text = cv_embedding_text(self.embedding_data(cv))
+                    index.add(cv.id, embedder.embed(text))
+                    count += 1
+            last_id = cvs[-1].id
+        return count
+
+    def backfill_canonical_skills(self, batch_size=500):
+        """Re-link every stored CV to canonical skills; returns the number of CVs.
+
+        Needed for CVs saved before canonical skills existed, or after the
+        normalization rules change. Canonical skills no CV links to anymore
+        are deleted afterwards, as are "Skills not found" rows saved by older
+        versions.
+        """
+        self.db.session.execute(delete(Skills).where(Skills.name == SKILLS_NOT_FOUND))
+        count, last_id = 0, 0
+        while True:
+            cvs = (
+                CV.query.filter(CV.id > last_id).order_by(CV.id).limit(batch_size).all()
+            )
+            if not cvs:
+                break
+            for cv in cvs:
+                self.link_canonical_skills(cv, [skill.name for skill in cv.skills])
+            self.db.session.commit()
+            count += len(cvs)
+            last_id = cvs[-1].id
+        self.db.session.execute(
+            delete(CanonicalSkill).where(
+                CanonicalSkill.id.not_in(select(cv_skills.c.skill_id))
+            )
+        )
+        self.db.session.commit()
+        return count
+
+    def canonical_skill_statement(self, skill):
+        """SELECT of the canonical skill ID matching a search term."""
+        key, _ = self.skill_index.canonicalize(skill)
+        return select(CanonicalSkill.id).where(CanonicalSkill.key == key)
+
+    def find_canonical_skill_id(self, skill):
+        """Look up the canonical skill ID for a search term, or None if unknown."""
+        return self.db.session.execute(self.canonical_skill_statement(skill)).scalar()
+
+    @staticmethod
+    def stored_outputs_statement(keys):
+        """SELECT of the stored outputs among ``keys``, in one round trip."""
+        return select(StoredOutput).where(StoredOutput.key.in_(set(keys)))
+
+    def find_stored_outputs(self, keys):
+        """Return ``{key: StoredOutput}`` for the keys present in the output store."""
+        if not keys:
+            return {}
+        outputs = self.db.session.execute(self.stored_outputs_statement(keys))
+        return {output.key: output for output in outputs.scalars()}
+
+    @staticmethod
+    def search_statement(
+        job_title=None, company=None, min_experience=None, skill=None, skill_id=None
+    ):
+        """Build the CV search SELECT, shared by the WSGI and ASGI apps."""
+        # Near-duplicates are stored but only their original is returned.
+        # Related rows are filtered with EXISTS so each CV comes back once.
+        statement = select(CV).where(
+            CV.path_of_cv.isnot(None), CV.duplicate_of.is_(None)
+        )
+
+        if job_title:
+            statement = statement.where(CV.job_title.ilike(f"%{job_title}%"))
+
+        if company:
+            statement = statement.where(
+                exists().where(
+                    Experiences.cv_id == CV.id,
+                    Experiences.company.ilike(f"%{company}%"),
+                )
+            )
+
+        if min_experience is not None:
+            statement = statement.where(CV.years_of_experience >= min_experience)
+
+        if skill:
+            # Known skills are matched by canonical ID through the indexed link table
+            if skill_id is not None:
+                statement = statement.where(
+                    exists().where(
+                        cv_skills.c.cv_id == CV.id, cv_skills.c.skill_id == skill_id
+                    )
+                )
+            else:
+                statement = statement.where(
+                    exists().where(
+                        Skills.cv_id == CV.id, Skills.name.ilike(f"%{skill}%")
+                    )
+                )
+
+        return statement
+
     def get_cv(self, cv_id):
         cv = CV.query.filter_by(id=cv_id).first()
 
@@ -0,0 +1,183 @@
+import argparse
+import glob
+import json
+import resource
+import time
+
+from cv_handler import CVHandler
+from cv_parser import CVParser
+from train_model import load_annotations, split_annotations
+
+# Annotation label -> parser output field it is scored against.
+LABEL_FIELDS = {
+    "PERSON_NAME": "name",
+    "SKILL": "skills",
+    "JOB_TITLE": "roles",
+    "ORGANIZATION": "companies",
+    "ADDRESS": "locations",
+}
+
+UPLOAD_PATTERNS = ["uploads/*.pdf", "uploads/*.docx", "uploads/*.png", "uploads/*.jpg"]
+
+
+def _normalize(value):
+    return " ".join(str(value).lower().split())
+
+
+def predicted_fields(parsed):
+    """Flatten ``CVParser.parse`` output into sets of values per scored field."""
+    experience = parsed.get("experience") or []
+    fields = {
+        "name": [parsed.get("name")],
+        "skills": (parsed.get("skills") or "").split(", "),
+        "roles": [parsed.get("position")] + [item.get("role") for item in experience],
+        "companies": [item.get("company") for item in experience],
+        "locations": [item.get("location") for item in experience],
+    }
+    return {
+        field: {
+            _normalize(value)
+            for value in values
+            if value and not str(value).endswith("not found")
+        }
+        for field, values in fields.items()
+    }
+
+
+def _matches(predicted, gold):
+    # Lenient match: the parser often returns a whole line around the entity.
+    return predicted == gold or gold in predicted or predicted in gold
+
+
+def score_fields(examples, parsed_docs):
+    """Per-field precision/recall of the parser output against the annotations.
+
+    A field is only scored on documents where it is annotated, since most
+    snippets only label some of the entity types.
+    """
+    counts = {
+        field: {"tp_p": 0, "pred": 0, "tp_r": 0, "gold": 0}
+        for field in set(LABEL_FIELDS.values())
+    }
+    for (text, entities), parsed in zip(examples, parsed_docs):
+        gold = {}
+        for start, end, label in entities:
+            field = LABEL_FIELDS.get(label)
+            if field:
+                gold.setdefault(field, set()).add(_normalize(text[start:end]))
+        predicted = predicted_fields(parsed)
+        for field, gold_values in gold.items():
+            pred_values = predicted.get(field, set())
+            count = counts[field]
+            count["pred"] += len(pred_values)
+            count["gold"] += len(gold_values)
+            count["tp_p"] += sum(
+                any(_matches(p, g) for g in gold_values) for p in pred_values
+            )
+            count["tp_r"] += sum(
+                any(_matches(p, g) for p in pred_values) for g in gold_values
+            )
+
+    scores = {}
+    for field, count in sorted(counts.items()):
+        scores[field] = {
+            "precision": count["tp_p"] / count["pred"] if count["pred"] else 0.0,
+            "recall": count["tp_r"] / count["gold"] if count["gold"] else 0.0,
+            "support": count["gold"],
+        }
+    return scores
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def evaluate(model=None, disable=(), include_uploads=True, split="dev"):
+    """Run one parser configuration over the corpus and return the report.
+
+    Accuracy is scored on the held-out dev split that ``train_model.py``
+    keeps out of training; ``split="all"`` scores every annotation, which
+    overstates a model trained on this corpus.
+    """
+    start = time.perf_counter()
+    parser = CVParser(model, disable=disable)
+    load_seconds = time.perf_counter() - start
+
+    examples = split_annotations()[1] if split == "dev" else load_annotations()
+    texts = [text for text, _ in examples]
+    if include_uploads:
+        for pattern in UPLOAD_PATTERNS:
+            for path in sorted(glob.glob(pattern)):
+                document = CVHandler.extract_document(path)
+                if document.text.strip():
+                    texts.append(document)
+
+    tokens = sum(len(parser.nlp.make_doc(getattr(text, "text", text))) for text in texts)
+    start = time.perf_counter()
+    parsed_docs = [parser.parse(text) for text in texts]
+    seconds = time.perf_counter() - start
+
+    return {
+        "model": model or parser.nlp.meta.get("name"),
+        "pipeline": parser.nlp.pipe_names,
+        "split": split,
+        "scored_examples": len(examples),
+        "documents": len(texts),
+        "load_seconds": round(load_seconds, 3),
+        "docs_per_sec": round(len(texts) / seconds, 2) if seconds else None,
+        "tokens_per_sec": round(tokens / seconds, 1) if seconds else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "fields": score_fields(examples, parsed_docs[: len(examples)]),
+    }
+
+
+def print_report(report):
+    print(f"Model: {report['model']} (pipeline: {', '.join(report['pipeline'])})")
+    print(
+        f"Documents: {report['documents']}  load: {report['load_seconds']}s  "
+        f"docs/sec: {report['docs_per_sec']}  tokens/sec: {report['tokens_per_sec']}  "
+        f"peak RSS: {report['peak_rss_mb']} MB"
+    )
+    print(
+        f"Accuracy on the {report['split']} split "
+        f"({report['scored_examples']} examples)"
+    )
+    print(f"{'field':<12}{'precision':>10}{'recall':>10}{'support':>10}")
+    for field, score in report["fields"].items():
+        print(
+            f"{field:<12}{score['precision']:>10.2f}{score['recall']:>10.2f}"
+            f"{score['support']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure parser accuracy and throughput over the annotated corpus."
+    )
+    parser.add_argument("--model", help="spaCy package or model directory to use")
+    parser.add_argument(
+        "--disable",
+        nargs="*",
+        default=[],
+        help="Pipeline components to disable, e.g. ner for a rule-only run",
+    )
+    parser.add_argument(
+        "--no-uploads", action="store_true", help="Skip the sample files in uploads/"
+    )
+    parser.add_argument(
+        "--split",
+        choices=["dev", "all"],
+        default="dev",
+        help="Annotations to score: the held-out dev split (default) or all of them",
+    )
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = evaluate(
+        args.model, args.disable, include_uploads=not args.no_uploads, split=args.split
+    )
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
@@ -2,6 +2,24 @@ from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
 
+# Many-to-many link between CVs and canonical skills, indexed both ways.
+cv_skills = db.Table(
+    "cv_skills",
+    db.Column(
+        "cv_id",
+        db.Integer,
+        db.ForeignKey("cv.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Column(
+        "skill_id",
+        db.Integer,
+        db.ForeignKey("canonical_skill.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
+)
+
 
 class CV(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -10,6 +28,14 @@ class CV(db.Model):
     path_of_cv = db.Column(db.String(255), nullable=False)
     phone = db.Column(db.String(255), nullable=True)
     email = db.Column(db.String(255), nullable=True)
+    minhash = db.Column(db.LargeBinary, nullable=True)
+    # Set on near-duplicate uploads; points at the original CV
+    duplicate_of = db.Column(
+        db.Integer,
+        db.ForeignKey("cv.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
     certificates = db.relationship(
         "Certificates", backref="cv", cascade="all, delete-orphan", lazy="dynamic"
     )
@@ -19,6 +45,15 @@ class CV(db.Model):
     experiences = db.relationship(
         "Experiences", backref="cv", cascade="all, delete-orphan", lazy="dynamic"
     )
+    fingerprints = db.relationship(
+        "CVFingerprint", backref="cv", cascade="all, delete-orphan", lazy="dynamic"
+    )
+    canonical_skills = db.relationship(
+        "CanonicalSkill",
+        secondary=cv_skills,
+        backref=db.backref("cvs", lazy="dynamic"),
+        lazy="dynamic",
+    )
 
     def __repr__(self):
         return f"<CV id={self.id}, job_title={self.job_title}, path_of_cv={self.path_of_cv}>"
@@ -40,6 +75,34 @@ class Skills(db.Model):
     name = db.Column(db.String(255), nullable=False)
 
 
+class CanonicalSkill(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(255), nullable=False, unique=True, index=True)
+    name = db.Column(db.String(255), nullable=False)
+
+
+class CVFingerprint(db.Model):
+    """One LSH band bucket of a CV's MinHash signature."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    cv_id = db.Column(
+        db.Integer, db.ForeignKey("cv.id", ondelete="CASCADE"), nullable=False
+    )
+    bucket = db.Column(db.BigInteger, nullable=False, index=True)
+
+
+class StoredOutput(db.Model):
+    """A filled CV in the output store; ``CV.path_of_cv`` holds its key.
+
+    Identical documents share one key, so this catalog answers existence
+    and size for a whole search result in one query.
+    """
+
+    key = db.Column(db.String(128), primary_key=True)
+    size = db.Column(db.BigInteger, nullable=False)
+    content_type = db.Column(db.String(255), nullable=False)
+
+
 class Experiences(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     cv_id = db.Column(
@@ -0,0 +1,77 @@
+import hashlib
+import random
+import re
+from array import array
+
+# 128 permutations split into 16 bands of 8 rows: CVs whose word shingles have
+# a Jaccard similarity around 0.7 or more share at least one band bucket.
+NUM_PERMUTATIONS = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 5
+# Estimated similarity above which a candidate counts as a near-duplicate.
+DUPLICATE_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_random = random.Random(1)
+_PERMUTATIONS = [
+    (_random.randrange(1, _MERSENNE_PRIME), _random.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def _hash(data, size=4):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=size).digest(), "little")
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Hashed word n-grams of the text, ignoring case, punctuation and layout."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        return {_hash(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        _hash(" ".join(words[i : i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def minhash_signature(text):
+    """MinHash signature of the text, or None if it has no words."""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    return array(
+        "I",
+        [
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in _PERMUTATIONS
+        ],
+    )
+
+
+def lsh_buckets(signature):
+    """One 64-bit bucket key per band; equal keys mean the band matched."""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        key = bytes([band]) + rows.tobytes()
+        value = _hash(key, size=8)
+        # Stored in a signed BIGINT column.
+        buckets.append(value - (1 << 64) if value >= (1 << 63) else value)
+    return buckets
+
+
+def estimate_similarity(signature, other):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(signature, other)) / NUM_PERMUTATIONS
+
+
+def signature_to_bytes(signature):
+    return signature.tobytes()
+
+
+def signature_from_bytes(data):
+    signature = array("I")
+    signature.frombytes(data)
+    return signature
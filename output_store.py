@@ -0,0 +1,251 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import zipfile
+
+OUTPUT_STORE = os.environ.get("CV_OUTPUT_STORE", "local")
+OUTPUT_ROOT = os.environ.get("CV_OUTPUT_ROOT", "output/objects")
+S3_BUCKET = os.environ.get("CV_S3_BUCKET", "cv-outputs")
+S3_PREFIX = os.environ.get("CV_S3_PREFIX", "filled/")
+S3_ENDPOINT_URL = os.environ.get("CV_S3_ENDPOINT_URL")
+
+DOCX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+)
+
+
+def content_digest(path):
+    """SHA-256 of a file's content.
+
+    DOCX files are ZIP containers whose member timestamps change on every
+    save, so for ZIP files only the member names and bytes are hashed.
+    """
+    digest = hashlib.sha256()
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in sorted(archive.infolist(), key=lambda info: info.filename):
+                digest.update(info.filename.encode() + b"\0")
+                with archive.open(info) as member:
+                    for chunk in iter(lambda: member.read(1 << 16), b""):
+                        digest.update(chunk)
+    else:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def object_key(path):
+    """Content-addressed key of a file: its digest plus its extension."""
+    return content_digest(path) + os.path.splitext(path)[1].lower()
+
+
+class ObjectInfo:
+    """Metadata of a stored object, as returned by ``put_file`` and ``head``."""
+
+    __slots__ = ("key", "size", "content_type")
+
+    def __init__(self, key, size, content_type):
+        self.key = key
+        self.size = size
+        self.content_type = content_type
+
+    def __repr__(self):
+        return f"<ObjectInfo {self.key} {self.size} bytes>"
+
+
+class LocalOutputStore:
+    """Content-addressed store on the local filesystem.
+
+    Objects live at ``root/<first two hex digits>/<key>``; a file whose
+    content is already stored is dropped instead of written again.
+    """
+
+    def __init__(self, root=OUTPUT_ROOT):
+        self.root = root
+        # Files are rendered next to the objects so moving them in is a rename
+        self.staging_dir = os.path.join(root, "tmp")
+
+    def local_path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def put_file(self, path, content_type=DOCX_CONTENT_TYPE):
+        """Move ``path`` into the store and return its ``ObjectInfo``."""
+        key = object_key(path)
+        target = self.local_path(key)
+        size = os.path.getsize(path)
+        if os.path.exists(target):
+            os.remove(path)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(path, target)
+        return ObjectInfo(key, size, content_type)
+
+    def head(self, key):
+        """Return the ``ObjectInfo`` of ``key``, or None if it is not stored."""
+        try:
+            size = os.path.getsize(self.local_path(key))
+        except OSError:
+            return None
+        return ObjectInfo(key, size, DOCX_CONTENT_TYPE)
+
+    def open(self, key):
+        return open(self.local_path(key), "rb")
+
+    def url(self, key, expires=3600):
+        """Direct download URL; local objects are served by the app instead."""
+        return None
+
+    def delete(self, key):
+        try:
+            os.remove(self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+
+class S3OutputStore:
+    """The same store on any S3-compatible service (AWS S3, MinIO, ...).
+
+    ``boto3`` is only needed when this backend is selected.
+    """
+
+    def __init__(
+        self, bucket=S3_BUCKET, prefix=S3_PREFIX, endpoint_url=S3_ENDPOINT_URL
+    ):
+        import boto3
+
+        self.staging_dir = None
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def local_path(self, key):
+        return None
+
+    def put_file(self, path, content_type=DOCX_CONTENT_TYPE):
+        key = object_key(path)
+        size = os.path.getsize(path)
+        if self.head(key) is None:
+            self.client.upload_file(
+                path,
+                self.bucket,
+                self.prefix + key,
+                ExtraArgs={"ContentType": content_type},
+            )
+        os.remove(path)
+        return ObjectInfo(key, size, content_type)
+
+    def head(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.client.head_object(
+                Bucket=self.bucket, Key=self.prefix + key
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return ObjectInfo(
+            key,
+            response["ContentLength"],
+            response.get("ContentType", DOCX_CONTENT_TYPE),
+        )
+
+    def open(self, key):
+        response = self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)
+        return response["Body"]
+
+    def url(self, key, expires=3600):
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": self.prefix + key},
+            ExpiresIn=expires,
+        )
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self.prefix + key)
+
+
+_output_store = None
+
+
+def get_output_store():
+    """Return the store selected by ``CV_OUTPUT_STORE`` (``local`` or ``s3``)."""
+    global _output_store
+    if _output_store is None:
+        if OUTPUT_STORE == "s3":
+            _output_store = S3OutputStore()
+        else:
+            _output_store = LocalOutputStore()
+    return _output_store
+
+
+def fill_and_store(processor, parsed_data, template_path="template.docx"):
+    """Render ``parsed_data`` into the template and put the result in the store."""
+    store = get_output_store()
+    if store.staging_dir:
+        os.makedirs(store.staging_dir, exist_ok=True)
+    fd, output_path = tempfile.mkstemp(suffix=".docx", dir=store.staging_dir)
+    os.close(fd)
+    try:
+        processor.fill_template(
+            parsed_data, template_path=template_path, output_path=output_path
+        )
+        # fill_template reports its own errors and leaves the file empty
+        if not os.path.getsize(output_path):
+            raise Exception("Error filling the template.")
+        return store.put_file(output_path)
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+
+def zip_outputs(entries, target):
+    """Write ``(key, archive_name)`` entries from the store into a ZIP at ``target``."""
+    store = get_output_store()
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for key, name in entries:
+            with store.open(key) as source, zip_file.open(name, "w") as destination:
+                shutil.copyfileobj(source, destination)
+
+
+def import_legacy_outputs():
+    """Copy filled CVs saved under plain paths into the store and re-point their rows.
+
+    Needs an app context. The old files are left in place.
+    """
+    from models import CV, StoredOutput, db
+
+    store = get_output_store()
+    stored = {key for (key,) in db.session.query(StoredOutput.key)}
+    imported = 0
+    for cv in CV.query.all():
+        if cv.path_of_cv in stored or not os.path.isfile(cv.path_of_cv):
+            continue
+        if store.staging_dir:
+            os.makedirs(store.staging_dir, exist_ok=True)
+        suffix = os.path.splitext(cv.path_of_cv)[1]
+        fd, staged_path = tempfile.mkstemp(suffix=suffix, dir=store.staging_dir)
+        os.close(fd)
+        shutil.copyfile(cv.path_of_cv, staged_path)
+        output = store.put_file(staged_path)
+        if output.key not in stored:
+            db.session.add(
+                StoredOutput(
+                    key=output.key, size=output.size, content_type=output.content_type
+                )
+            )
+            stored.add(output.key)
+        cv.path_of_cv = output.key
+        imported += 1
+    db.session.commit()
+    return imported
+
+
+if __name__ == "__main__":
+    from app import app
+
+    with app.app_context():
+        print(f"Imported {import_legacy_outputs()} filled CVs into the output store.")
@@ -0,0 +1,211 @@
+from dataclasses import dataclass, field
+
+import msgpack
+
+# Bumped whenever the positional msgpack layout below changes.
+SCHEMA_VERSION = 1
+
+MSGPACK_MIMETYPE = "application/msgpack"
+
+
+@dataclass(slots=True)
+class ExperienceEntry:
+    dates: str | None = None
+    location: str | None = None
+    role: str | None = None
+    company: str | None = None
+    description: str | None = None
+
+    def to_list(self):
+        return [self.dates, self.location, self.role, self.company, self.description]
+
+
+@dataclass(slots=True)
+class ParsedCV:
+    """Typed, slotted record of ``CVParser.parse`` output.
+
+    Serialized to msgpack as positional arrays rather than keyed maps; this
+    is the compact form ``/api/parse`` returns to clients that accept
+    ``application/msgpack``. Run this module on sample CVs to compare it
+    with pickled dicts.
+    """
+
+    name: str | None = None
+    email: str | None = None
+    phone: str | None = None
+    position: str | None = None
+    years_of_experience: int = 0
+    education: str = ""
+    certificates: str = ""
+    languages: str = ""
+    skills: str = ""
+    experience: list = field(default_factory=list)
+    path_of_cv: str | None = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build the record from a parse result dict."""
+        contact = data.get("contact") or {}
+        return cls(
+            name=data.get("name"),
+            email=contact.get("email"),
+            phone=contact.get("phone"),
+            position=data.get("position"),
+            years_of_experience=int(data.get("years_of_experience") or 0),
+            education=data.get("education") or "",
+            certificates=data.get("certificates") or "",
+            languages=data.get("languages") or "",
+            skills=data.get("skills") or "",
+            experience=[
+                ExperienceEntry(
+                    dates=item.get("dates"),
+                    location=item.get("location"),
+                    role=item.get("role"),
+                    company=item.get("company"),
+                    description=item.get("description"),
+                )
+                for item in data.get("experience") or []
+            ],
+            path_of_cv=data.get("path_of_cv"),
+        )
+
+    def to_dict(self):
+        """Return the record in the dict shape produced by ``CVParser.parse``."""
+        data = {
+            "name": self.name,
+            "contact": {"email": self.email, "phone": self.phone},
+            "position": self.position,
+            "years_of_experience": self.years_of_experience,
+            "education": self.education,
+            "certificates": self.certificates,
+            "languages": self.languages,
+            "skills": self.skills,
+            "experience": [
+                {
+                    "dates": item.dates,
+                    "location": item.location,
+                    "role": item.role,
+                    "company": item.company,
+                    "description": item.description,
+                }
+                for item in self.experience
+            ],
+        }
+        if self.path_of_cv is not None:
+            data["path_of_cv"] = self.path_of_cv
+        return data
+
+    def to_list(self):
+        """Positional form of the record, led by ``SCHEMA_VERSION``."""
+        return [
+            SCHEMA_VERSION,
+            self.name,
+            self.email,
+            self.phone,
+            self.position,
+            self.years_of_experience,
+            self.education,
+            self.certificates,
+            self.languages,
+            self.skills,
+            [item.to_list() for item in self.experience],
+            self.path_of_cv,
+        ]
+
+    def to_msgpack(self):
+        return msgpack.packb(self.to_list(), use_bin_type=True)
+
+    @classmethod
+    def from_msgpack(cls, data):
+        return cls.from_list(msgpack.unpackb(data, raw=False))
+
+    @classmethod
+    def from_list(cls, values):
+        version = values[0]
+        if version != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported parsed CV schema version: {version}")
+        (
+            name,
+            email,
+            phone,
+            position,
+            years_of_experience,
+            education,
+            certificates,
+            languages,
+            skills,
+            experience,
+            path_of_cv,
+        ) = values[1:]
+        return cls(
+            name=name,
+            email=email,
+            phone=phone,
+            position=position,
+            years_of_experience=years_of_experience,
+            education=education,
+            certificates=certificates,
+            languages=languages,
+            skills=skills,
+            experience=[ExperienceEntry(*item) for item in experience],
+            path_of_cv=path_of_cv,
+        )
+
+
+def pack_parse_results(results):
+    """msgpack body of an ``/api/parse`` response; parsed data as positional records."""
+    packed = []
+    for result in results:
+        if "data" in result:
+            record = ParsedCV.from_dict(result["data"])
+            result = {"source": result["source"], "data": record.to_list()}
+        packed.append(result)
+    return msgpack.packb({"results": packed}, use_bin_type=True)
+
+
+def benchmark(parsed_results, repeat=1000):
+    """Compare size and encode/decode time of pickled dicts and msgpack records."""
+    import pickle
+    import time
+
+    records = [ParsedCV.from_dict(data) for data in parsed_results]
+    codecs = {
+        "pickle(dict)": (
+            lambda: [pickle.dumps(data) for data in parsed_results],
+            pickle.loads,
+        ),
+        "msgpack(ParsedCV)": (
+            lambda: [record.to_msgpack() for record in records],
+            ParsedCV.from_msgpack,
+        ),
+    }
+    for name, (encode_all, decode) in codecs.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            encoded = encode_all()
+        encode_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for blob in encoded:
+                decode(blob)
+        decode_seconds = time.perf_counter() - start
+        count = repeat * len(encoded)
+        print(
+            f"{name:<18} bytes/CV: {sum(map(len, encoded)) / len(encoded):8.0f}  "
+            f"encode: {encode_seconds / count * 1e6:7.1f} us  "
+            f"decode: {decode_seconds / count * 1e6:7.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    import sys
+
+    from cv_processor import CVProcessor
+
+    if len(sys.argv) < 2:
+        print("Usage: python parsed_cv.py <path_to_cv_file> [...]")
+        sys.exit(1)
+
+    processor = CVProcessor()
+    results = [processor.process(path) for path in sys.argv[1:]]
+    benchmark([data for data in results if data])
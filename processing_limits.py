@@ -0,0 +1,75 @@
+import time
+
+from env_config import env_int
+
+
+class InputTooLarge(ValueError):
+    """An input rejected for exceeding ``ProcessingLimits.max_bytes``."""
+
+
+class ProcessingLimits:
+    """Per-stage budgets that keep one pathological document from pinning a worker.
+
+    Inputs over ``max_bytes`` are rejected, and so are whole requests over
+    ``max_request_bytes`` before their body is read. Pages past ``max_pages``, text
+    past ``max_chars`` and anything left when ``max_seconds`` of extraction
+    have elapsed are dropped, and oversized images are downscaled before
+    OCR. ``job_timeout`` is the hard limit RQ enforces by killing the work
+    horse process that runs the job; with ``CV_WORKER_FORK=0`` there is no
+    work horse and it is only a SIGALRM in the worker process.
+    """
+
+    def __init__(
+        self,
+        max_bytes=20 * 1024 * 1024,
+        max_request_bytes=100 * 1024 * 1024,
+        max_pages=20,
+        max_chars=100_000,
+        max_seconds=120,
+        max_image_pixels=25_000_000,
+        ocr_timeout=30,
+        job_timeout=300,
+    ):
+        self.max_bytes = max_bytes
+        self.max_request_bytes = max_request_bytes
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.max_seconds = max_seconds
+        self.max_image_pixels = max_image_pixels
+        self.ocr_timeout = ocr_timeout
+        self.job_timeout = job_timeout
+
+    @classmethod
+    def from_env(cls):
+        """Read the budgets from ``CV_MAX_*`` environment variables."""
+        defaults = cls()
+        return cls(
+            max_bytes=env_int("CV_MAX_BYTES", defaults.max_bytes),
+            max_request_bytes=env_int(
+                "CV_MAX_REQUEST_BYTES", defaults.max_request_bytes
+            ),
+            max_pages=env_int("CV_MAX_PAGES", defaults.max_pages),
+            max_chars=env_int("CV_MAX_CHARS", defaults.max_chars),
+            max_seconds=env_int("CV_MAX_SECONDS", defaults.max_seconds),
+            max_image_pixels=env_int("CV_MAX_IMAGE_PIXELS", defaults.max_image_pixels),
+            ocr_timeout=env_int("CV_OCR_TIMEOUT", defaults.ocr_timeout),
+            job_timeout=env_int("CV_JOB_TIMEOUT", defaults.job_timeout),
+        )
+
+    def deadline(self):
+        return time.monotonic() + self.max_seconds
+
+    def ocr_timeout_before(self, deadline):
+        """Seconds a single OCR call may take without running past ``deadline``."""
+        return max(1, min(self.ocr_timeout, int(deadline - time.monotonic())))
+
+
+DEFAULT_LIMITS = ProcessingLimits.from_env()
+
+
+def upload_size(stream):
+    """Size of a spooled upload, measured without reading it into memory."""
+    position = stream.tell()
+    size = stream.seek(0, 2)
+    stream.seek(position)
+    return size
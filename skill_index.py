@@ -0,0 +1,75 @@
+import os
+import re
+
+SKILL_ALIASES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "dictionaries", "skill_aliases.txt"
+)
+
+# Trailing version numbers ("Python3", "Angular 2", "HTML5") don't change the skill.
+# At least three letters must come first, so "S3", "EC2", "D3" and "ES6" stay
+# distinct skills rather than collapsing into "s", "ec", "d" and "es".
+VERSION_SUFFIX = re.compile(r"(?<=[a-z+#]{3})[\s\-_]*v?\d+(\.\d+)*$")
+
+# What CVParser.extract_skills returns for a CV without skills; never stored.
+SKILLS_NOT_FOUND = "Skills not found"
+
+
+def normalize_skill(text):
+    """Reduce a skill surface form to its lookup key."""
+    key = " ".join(text.lower().split())
+    return VERSION_SUFFIX.sub("", key)
+
+
+def skill_names(skills):
+    """Split a comma-separated skills field, dropping blanks and the sentinel."""
+    names = (skill.strip() for skill in skills.split(","))
+    return [name for name in names if name and name != SKILLS_NOT_FOUND]
+
+
+class SkillIndex:
+    """Maps skill surface forms to canonical skills through a precomputed alias index."""
+
+    def __init__(self, aliases):
+        # aliases: {canonical name: [alias, ...]}
+        self.index = {}
+        for canonical, surface_forms in aliases.items():
+            for surface in [canonical, *surface_forms]:
+                self.index[normalize_skill(surface)] = canonical
+
+    @classmethod
+    def from_file(cls, path=SKILL_ALIASES_PATH):
+        """Read ``Canonical: alias, alias`` lines, skipping blanks and ``#`` comments."""
+        aliases = {}
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                canonical, _, surface_forms = line.partition(":")
+                aliases[canonical.strip()] = [
+                    alias.strip() for alias in surface_forms.split(",") if alias.strip()
+                ]
+        return cls(aliases)
+
+    def canonicalize(self, text):
+        """Return ``(key, name)`` of the canonical skill for a surface form.
+
+        Skills missing from the index become their own canonical skill, keyed
+        by their normalized form.
+        """
+        key = normalize_skill(text)
+        canonical = self.index.get(key)
+        if canonical is None:
+            return key, text.strip()
+        return normalize_skill(canonical), canonical
+
+
+_skill_index = None
+
+
+def get_skill_index():
+    """Return the shared index, built from the alias file on first use."""
+    global _skill_index
+    if _skill_index is None:
+        _skill_index = SkillIndex.from_file()
+    return _skill_index
@@ -1,5 +1,4 @@
 import os
-from spacy import load
 from werkzeug.utils import secure_filename
 from cv_processor import (
     CVProcessor,
@@ -9,7 +8,11 @@ from cv_service import (
 )  # Assuming CVService handles saving parsed CV data to the database
 import io
 
+from rq import get_current_job
+
 from models import db
+from output_store import fill_and_store
+from vector_index import index_cv
 
 
 class tasks:
@@ -26,31 +29,42 @@ class tasks:
             f.write(file_content)
 
         processor = CVProcessor()
-        parsed_data = processor.process(upload_path)
+        service = CVService(db)
+        job = get_current_job()
+        try:
+            document = processor.extract(upload_path)
+        finally:
+            # Record what was extracted, truncated or rejected on the job
+            if job is not None:
+                job.meta["extraction"] = processor.last_extraction
+                job.save_meta()
 
-        if not parsed_data:
-            raise Exception("Error processing CV.")
+        # A near-duplicate is still stored, linked to the original and kept out of
+        # search results and the similarity index
+        duplicate_id, signature = service.find_duplicate(document.text)
 
-        # Define the output directory for the filled CV
-        output_dir = "output"
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        parsed_data = processor.process(upload_path, document)
 
-        # Define the output path
-        output_path = os.path.join(output_dir, f"filled_{filename}.docx")
+        if not parsed_data:
+            raise Exception("Error processing CV.")
 
-        # Fill the template with parsed data
-        processor.fill_template(
-            parsed_data, template_path="template.docx", output_path=output_path
-        )
+        # Fill the template and keep the result in the content-addressed store
+        output = fill_and_store(processor, parsed_data, template_path="template.docx")
 
         # Save parsed data to the database
-        service = CVService(db)
-        parsed_data["path_of_cv"] = output_path
-        service.save_cv(parsed_data)
+        parsed_data["path_of_cv"] = output.key
+        cv_id = service.save_cv(parsed_data, signature, output, duplicate_id)
 
-        # Check if the output file was created
-        if not os.path.exists(output_path):
-            raise Exception("Error: Output file not found.")
+        # Add the CV to the similarity search index
+        indexed = False
+        if duplicate_id is None:
+            indexed = index_cv(cv_id, parsed_data, processor.parser.nlp)
 
-        return {"status": "success", "output_path": output_path}
+        # The parsed CV is in the database under cv_id; keep the result small
+        return {
+            "status": "success",
+            "cv_id": cv_id,
+            "output_key": output.key,
+            "duplicate_of": duplicate_id,
+            "indexed": indexed,
+        }
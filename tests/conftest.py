@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+import pytest
+
+# Settings are read at import time; keep the tests off the real database,
+# output store and index
+_scratch = tempfile.mkdtemp(prefix="cv-tests-")
+os.environ["CV_DATABASE_URI"] = f"sqlite:///{_scratch}/cv.db"
+os.environ["CV_ASYNC_DATABASE_URI"] = f"sqlite+aiosqlite:///{_scratch}/cv.db"
+os.environ["CV_OUTPUT_STORE"] = "local"
+os.environ["CV_OUTPUT_ROOT"] = os.path.join(_scratch, "objects")
+os.environ["CV_INDEX_FOLDER"] = os.path.join(_scratch, "index")
+
+
+@pytest.fixture(scope="session")
+def parser(tmp_path_factory):
+    """A CVParser on a blank pipeline; enough for the rule-based extractors."""
+    import spacy
+
+    from cv_parser import CVParser
+
+    model = tmp_path_factory.mktemp("model")
+    spacy.blank("en").to_disk(model)
+    return CVParser(model=str(model))
+
+
+@pytest.fixture
+def db():
+    """An app context over an empty database."""
+    from app import app
+    from models import db
+
+    with app.app_context():
+        db.create_all()
+        yield db
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,51 @@
+import io
+
+import pytest
+
+import app as app_module
+from processing_limits import DEFAULT_LIMITS
+
+
+@pytest.fixture
+def client(parser, monkeypatch):
+    monkeypatch.setattr(app_module, "_parser", parser)
+    return app_module.app.test_client()
+
+
+@pytest.mark.parametrize(
+    "body, error",
+    [
+        (["Jane Doe"], "JSON body must be an object"),
+        ({"texts": 5}, "texts must be a string or a list of strings"),
+        ({}, "No files or texts provided"),
+    ],
+)
+def test_invalid_payloads_are_400(client, body, error):
+    response = client.post("/api/parse", json=body)
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": error}
+
+
+def test_each_text_gets_a_result_in_order(client):
+    response = client.post(
+        "/api/parse", json={"texts": ["Jane Doe\nSkills\nPython", 5, "  "]}
+    )
+
+    results = response.get_json()["results"]
+    assert response.status_code == 200
+    assert results[0]["source"] == "texts[0]" and "data" in results[0]
+    assert results[1] == {"source": "texts[1]", "error": "texts items must be strings"}
+    assert results[2] == {"source": "texts[2]", "error": "Empty text"}
+
+
+def test_files_share_one_deadline(client, monkeypatch):
+    monkeypatch.setattr(DEFAULT_LIMITS, "max_seconds", -1)
+    files = [(io.BytesIO(b"%PDF-1.4"), f"{index}.pdf") for index in range(2)]
+
+    response = client.post("/api/parse", data={"files[]": files})
+
+    assert response.get_json()["results"] == [
+        {"source": "0.pdf", "error": "Time budget exceeded"},
+        {"source": "1.pdf", "error": "Time budget exceeded"},
+    ]
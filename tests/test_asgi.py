@@ -0,0 +1,63 @@
+import os
+
+import pytest
+from starlette.datastructures import FormData
+from starlette.testclient import TestClient
+
+import asgi
+from models import CV, StoredOutput
+
+
+@pytest.fixture
+def client(db):
+    with TestClient(asgi.application) as client:
+        yield client
+
+
+@pytest.fixture
+def stored_cv(db):
+    db.session.add(StoredOutput(key="abc.docx", size=10, content_type="x"))
+    db.session.add(CV(job_title="Data Analyst", path_of_cv="abc.docx"))
+    db.session.commit()
+
+
+def test_upload_form_is_closed_when_enqueueing_fails(client, monkeypatch):
+    class BrokenQueue:
+        def enqueue(self, *args, **kwargs):
+            raise ConnectionError("Redis is down")
+
+    closed = []
+    close = FormData.close
+
+    async def recording_close(form):
+        closed.append(form)
+        await close(form)
+
+    monkeypatch.setattr(asgi, "get_queue", BrokenQueue)
+    monkeypatch.setattr(FormData, "close", recording_close)
+
+    with pytest.raises(ConnectionError):
+        client.post("/upload_cvs", files={"files[]": ("cv.pdf", b"%PDF-1.4")})
+    assert len(closed) == 1
+
+
+def test_failed_zip_is_removed(client, stored_cv, monkeypatch):
+    targets = []
+
+    def broken_zip(entries, target):
+        targets.append(target)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(asgi, "zip_outputs", broken_zip)
+
+    response = client.post("/generate_cv", data={"job_title": "Analyst"})
+
+    assert response.status_code == 500
+    assert len(targets) == 1 and not os.path.exists(targets[0])
+
+
+def test_download_of_a_missing_local_file_is_404(client, stored_cv):
+    response = client.get("/download/abc.docx")
+
+    assert response.status_code == 404
+    assert client.get("/download/unknown.docx").status_code == 404
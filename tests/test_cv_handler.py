@@ -0,0 +1,165 @@
+import io
+import time
+
+import pytest
+
+import app as app_module
+from cv_document import CVDocument
+from cv_handler import CVHandler
+from processing_limits import InputTooLarge, ProcessingLimits
+
+
+def write_pdf(path, pages):
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    count = len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(count))
+        + b"] /Count %d >>" % count,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for index, text in enumerate(pages):
+        stream = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode()
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (5 + 2 * index)
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(data)
+    return str(path)
+
+
+def sample_document():
+    document = CVDocument()
+    document.add_block("Skills")
+    document.add_block("Python, SQL")
+    document.add_page()
+    document.add_block("Education")
+    return document
+
+
+@pytest.mark.parametrize(
+    "max_chars, text, pages",
+    [
+        (19, "Skills\nPython, SQL", 1),
+        (20, "Skills\nPython, SQL", 1),
+        (28, "Skills\nPython, SQL", 1),
+        (29, "Skills\nPython, SQL\n\nEducation", 2),
+        (10, "Skills", 1),
+    ],
+)
+def test_truncated_keeps_whole_blocks(max_chars, text, pages):
+    truncated = sample_document().truncated(max_chars)
+
+    assert truncated.text == text
+    assert len(truncated.pages) == pages
+
+
+def test_truncated_cuts_an_oversized_first_block():
+    truncated = sample_document().truncated(3)
+
+    assert truncated.text == "Ski"
+    assert len(truncated.blocks) == 1
+
+
+def test_pdf_pages_past_max_pages_are_dropped(tmp_path):
+    path = write_pdf(tmp_path / "cv.pdf", ["Jane Doe", "Skills", "Education"])
+    report = {}
+
+    document = CVHandler.extract_document(path, report, ProcessingLimits(max_pages=2))
+
+    assert "Education" not in document.text
+    assert report["pages"] == ["pypdf2", "pypdf2"]
+    assert report["truncated"] == ["max_pages"]
+
+
+def test_pdf_extraction_stops_at_the_deadline(tmp_path):
+    path = write_pdf(tmp_path / "cv.pdf", ["Jane Doe", "Skills"])
+    report = {}
+
+    document = CVHandler.extract_document(path, report, deadline=time.monotonic() - 1)
+
+    assert document.text == ""
+    assert report["truncated"] == ["max_seconds"]
+
+
+def test_pdfplumber_fallback_honours_the_limits(tmp_path, monkeypatch):
+    import PyPDF2
+
+    def broken_reader(*args, **kwargs):
+        raise ValueError("unreadable xref")
+
+    monkeypatch.setattr(PyPDF2, "PdfReader", broken_reader)
+    path = write_pdf(tmp_path / "cv.pdf", ["Jane Doe", "Skills", "Education"])
+
+    report = {}
+    document = CVHandler.extract_document(path, report, ProcessingLimits(max_pages=2))
+    assert report["pages"] == ["pdfplumber", "pdfplumber"]
+    assert report["truncated"] == ["max_pages"]
+    assert "Education" not in document.text
+
+    report = {}
+    CVHandler.extract_document(path, report, deadline=time.monotonic() - 1)
+    assert report["pages"] == []
+    assert report["truncated"] == ["max_seconds"]
+
+
+def test_ocr_timeout_is_reported(tmp_path, monkeypatch):
+    import pytesseract
+    from PIL import Image
+
+    def timeout(image, timeout=0):
+        raise RuntimeError("Tesseract process timeout")
+
+    monkeypatch.setattr(pytesseract, "image_to_string", timeout)
+    path = tmp_path / "cv.png"
+    Image.new("RGB", (20, 20), "white").save(path)
+    report = {}
+
+    document = CVHandler.extract_document(str(path), report)
+
+    assert document.text == ""
+    assert report["pages"] == ["ocr"]
+    assert report["truncated"] == ["ocr_timeout"]
+
+
+def test_files_over_max_bytes_are_rejected(tmp_path):
+    path = write_pdf(tmp_path / "cv.pdf", ["Jane Doe"])
+    report = {}
+
+    with pytest.raises(InputTooLarge):
+        CVHandler.extract_document(path, report, ProcessingLimits(max_bytes=10))
+    assert report["rejected"] == "max_bytes"
+
+
+def test_upload_status_codes(parser, monkeypatch, tmp_path):
+    import cv_parser
+    from processing_limits import DEFAULT_LIMITS
+
+    monkeypatch.setattr(cv_parser, "CVParser", lambda: parser)
+    monkeypatch.setattr(app_module.app, "root_path", str(tmp_path))
+    (tmp_path / "uploads").mkdir()
+    client = app_module.app.test_client()
+
+    response = client.post("/upload", data={"file": (io.BytesIO(b"plain"), "cv.txt")})
+    assert response.status_code == 415
+
+    monkeypatch.setattr(DEFAULT_LIMITS, "max_bytes", 2)
+    response = client.post("/upload", data={"file": (io.BytesIO(b"plain"), "cv.txt")})
+    assert response.status_code == 413
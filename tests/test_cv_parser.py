@@ -0,0 +1,93 @@
+from cv_document import CVDocument
+from cv_segmenter import SectionSegmenter
+
+
+def test_skill_matches_in_a_section_map_back_to_the_doc(parser):
+    text = (
+        "Jane Doe\n"
+        "Experience\n"
+        "Data analyst at Acme\n"
+        "Skills\n"
+        "Strong background in python development"
+    )
+    doc = parser.nlp(text)
+    sections = parser.segmenter.segment(text)
+
+    skills = parser.extract_skills(doc, sections).split(", ")
+
+    # Only the matcher finds the single token; the line itself is kept whole
+    assert "python" in skills
+    assert "Strong background in python development" in skills
+    assert not any("Acme" in skill for skill in skills)
+
+
+def test_section_sents_are_clipped_to_the_section(parser):
+    # No sentence break between the sections, so one sentence spans both
+    text = "Experience\nWorked at Acme for 3 years\nEducation\nBSc Computer Science."
+    doc = parser.nlp(text)
+    sections = parser.segmenter.segment(text)
+    assert len(list(doc.sents)) == 1
+
+    sents = parser._section_sents(doc, sections, "experience")
+
+    assert [sent.text.strip() for sent in sents] == ["Worked at Acme for 3 years"]
+    (start, end), = sections["experience"]
+    assert all(start <= sent.start_char and sent.end_char <= end for sent in sents)
+
+
+def test_section_sents_is_none_without_the_section(parser):
+    text = "Jane Doe\nWorked at Acme for 3 years."
+    doc = parser.nlp(text)
+    sections = parser.segmenter.segment(text)
+
+    assert parser._section_sents(doc, sections, "education") is None
+
+
+def layout_document(blocks):
+    """A ``CVDocument`` of ``(text, level)`` pairs; level None is a paragraph."""
+    document = CVDocument()
+    for text, level in blocks:
+        if level is None:
+            document.add_block(text)
+        else:
+            document.add_block(text, "heading", level)
+    return document
+
+
+def section_texts(document):
+    sections = SectionSegmenter().segment(document.text, document)
+    return {
+        name: [document.text[start:end].strip() for start, end in spans]
+        for name, spans in sections.items()
+    }
+
+
+def test_subheading_inside_a_section_does_not_end_it():
+    document = layout_document(
+        [
+            ("Experience", 1),
+            ("Senior Data Analyst", 2),
+            ("Acme, 2019-2024", None),
+            ("Education", 1),
+            ("BSc Statistics", None),
+        ]
+    )
+
+    sections = section_texts(document)
+
+    assert sections["experience"] == ["Senior Data Analyst\nAcme, 2019-2024"]
+    assert sections["education"] == ["BSc Statistics"]
+
+
+def test_unknown_heading_at_the_same_level_ends_the_section():
+    document = layout_document(
+        [
+            ("Skills", 1),
+            ("Python, SQL", None),
+            ("Projects", 1),
+            ("Sales dashboard in Tableau", None),
+        ]
+    )
+
+    assert section_texts(document) == {"skills": ["Python, SQL"]}
+
@@ -0,0 +1,64 @@
+from cv_service import CVService
+from models import CanonicalSkill, Skills
+
+
+def parsed(skills, experience=()):
+    return {
+        "position": "Data Analyst",
+        "path_of_cv": "cv.docx",
+        "years_of_experience": 3,
+        "contact": {},
+        "certificates": "",
+        "skills": skills,
+        "experience": list(experience),
+    }
+
+
+def search(db, service, **criteria):
+    if criteria.get("skill"):
+        criteria["skill_id"] = service.find_canonical_skill_id(criteria["skill"])
+    statement = service.search_statement(**criteria)
+    # No .unique(): every CV must come back as a single row
+    return [cv.id for cv in db.session.execute(statement).scalars().all()]
+
+
+def test_cv_without_skills_gets_no_sentinel_skill(db):
+    service = CVService(db)
+    cv_id = service.save_cv(parsed("Skills not found"))
+
+    assert Skills.query.filter_by(cv_id=cv_id).count() == 0
+    assert CanonicalSkill.query.count() == 0
+
+
+def test_backfill_drops_stored_sentinels(db):
+    service = CVService(db)
+    cv_id = service.save_cv(parsed("Python"))
+    db.session.add(Skills(cv_id=cv_id, name="Skills not found"))
+    db.session.commit()
+
+    service.backfill_canonical_skills()
+
+    assert [skill.name for skill in Skills.query] == ["Python"]
+    assert [skill.key for skill in CanonicalSkill.query] == ["python"]
+
+
+def test_search_returns_each_cv_once(db):
+    service = CVService(db)
+    experience = [{"company": "Acme"}, {"company": "Acme Labs"}]
+    cv_id = service.save_cv(parsed("Python, py, SQL", experience))
+
+    assert search(db, service, skill="Python") == [cv_id]
+    assert search(db, service, skill="SQ") == [cv_id]
+    assert search(db, service, company="Acme") == [cv_id]
+    assert search(db, service, company="Initech") == []
+
+
+def test_search_by_canonical_skill_needs_no_skills_row(db):
+    service = CVService(db)
+    cv_id = service.save_cv(parsed("Python3"))
+    # Only the canonical link is left, e.g. after the free-text rows were pruned
+    Skills.query.filter_by(cv_id=cv_id).delete()
+    db.session.commit()
+
+    assert search(db, service, skill="py") == [cv_id]
+    assert search(db, service) == [cv_id]
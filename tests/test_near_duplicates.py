@@ -0,0 +1,87 @@
+from cv_service import CVService
+from models import CV
+from near_duplicates import (
+    BANDS,
+    DUPLICATE_THRESHOLD,
+    estimate_similarity,
+    lsh_buckets,
+    minhash_signature,
+)
+
+CV_TEXT = (
+    "Jane Doe\n"
+    "Senior data analyst with seven years of experience building reporting "
+    "pipelines in Python and SQL for retail and logistics companies. Led the "
+    "migration of the sales dashboards to Tableau and trained a team of four "
+    "analysts on dimensional modelling and data quality checks."
+)
+# The same CV with a new phone number and one more skill
+UPDATED_TEXT = CV_TEXT.replace("Jane Doe\n", "Jane Doe\n+1 555 0100\n") + " Airflow."
+OTHER_TEXT = (
+    "John Smith\n"
+    "Mobile developer shipping Kotlin and Swift apps for banks, with a focus "
+    "on offline sync, accessibility and release automation across app stores."
+)
+
+
+def parsed(skills="Python, SQL"):
+    return {
+        "position": "Data Analyst",
+        "path_of_cv": "cv.docx",
+        "years_of_experience": 7,
+        "contact": {},
+        "certificates": "",
+        "skills": skills,
+        "experience": [{"company": "Acme", "dates": None}],
+    }
+
+
+def test_minhash_signature_ignores_case_and_layout():
+    signature = minhash_signature(CV_TEXT)
+
+    assert signature == minhash_signature(CV_TEXT.upper().replace("\n", "  "))
+    assert minhash_signature(" \n.,") is None
+
+
+def test_near_duplicates_score_above_the_threshold():
+    signature = minhash_signature(CV_TEXT)
+
+    assert estimate_similarity(signature, minhash_signature(UPDATED_TEXT)) >= (
+        DUPLICATE_THRESHOLD
+    )
+    assert estimate_similarity(signature, minhash_signature(OTHER_TEXT)) < 0.2
+
+
+def test_lsh_buckets_are_shared_by_near_duplicates_only():
+    buckets = lsh_buckets(minhash_signature(CV_TEXT))
+
+    assert len(buckets) == BANDS
+    assert all(-(1 << 63) <= bucket < (1 << 63) for bucket in buckets)
+    assert set(buckets) & set(lsh_buckets(minhash_signature(UPDATED_TEXT)))
+    assert not set(buckets) & set(lsh_buckets(minhash_signature(OTHER_TEXT)))
+
+
+def test_find_duplicate(db):
+    service = CVService(db)
+    assert service.find_duplicate(CV_TEXT)[0] is None
+    original_id = service.save_cv(parsed(), minhash_signature(CV_TEXT))
+
+    duplicate_id, signature = service.find_duplicate(UPDATED_TEXT)
+    assert duplicate_id == original_id
+    assert service.find_duplicate(OTHER_TEXT)[0] is None
+
+    # A duplicate of a duplicate links to the original
+    copy_id = service.save_cv(parsed(), signature, duplicate_of=duplicate_id)
+    assert db.session.get(CV, copy_id).duplicate_of == original_id
+    assert service.find_duplicate(UPDATED_TEXT)[0] == original_id
+
+
+def test_duplicates_are_left_out_of_search(db):
+    service = CVService(db)
+    original_id = service.save_cv(parsed(), minhash_signature(CV_TEXT))
+    service.save_cv(parsed(), minhash_signature(UPDATED_TEXT), duplicate_of=original_id)
+
+    statement = service.search_statement(skill="Python")
+    found = db.session.execute(statement).scalars().unique().all()
+
+    assert [cv.id for cv in found] == [original_id]
@@ -0,0 +1,68 @@
+import os
+import zipfile
+
+import pytest
+
+import output_store
+from cv_processor import CVProcessor
+from output_store import LocalOutputStore, content_digest, fill_and_store
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "template.docx")
+
+PARSED = {
+    "name": "Jane Doe",
+    "contact": {"email": "jane@example.com", "phone": None},
+    "position": "Data Analyst",
+    "years_of_experience": 7,
+    "skills": "Python, SQL",
+    "experience": [{"company": "Acme", "role": "Data Analyst"}],
+}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = LocalOutputStore(str(tmp_path / "objects"))
+    monkeypatch.setattr(output_store, "_output_store", store)
+    return store
+
+
+def stored_files(store):
+    return [
+        name
+        for folder, _, names in os.walk(store.root)
+        if folder != store.staging_dir
+        for name in names
+    ]
+
+
+def test_filling_the_same_data_twice_stores_one_object(store):
+    # fill_template is a staticmethod, so no parser has to be loaded
+    first = fill_and_store(CVProcessor, PARSED, template_path=TEMPLATE)
+    second = fill_and_store(CVProcessor, PARSED, template_path=TEMPLATE)
+
+    assert first.key == second.key
+    assert first.key.endswith(".docx")
+    assert stored_files(store) == [first.key]
+    assert os.listdir(store.staging_dir) == []
+    assert store.head(first.key).size == first.size
+
+
+def test_different_data_gets_a_different_key(store):
+    first = fill_and_store(CVProcessor, PARSED, template_path=TEMPLATE)
+    second = fill_and_store(
+        CVProcessor, dict(PARSED, position="Data Engineer"), template_path=TEMPLATE
+    )
+
+    assert first.key != second.key
+    assert sorted(stored_files(store)) == sorted([first.key, second.key])
+
+
+def test_zip_members_are_hashed_without_their_timestamps(tmp_path):
+    paths = []
+    for index, date_time in enumerate([(2020, 1, 1, 0, 0, 0), (2024, 6, 1, 12, 0, 0)]):
+        path = tmp_path / f"{index}.docx"
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr(zipfile.ZipInfo("word/document.xml", date_time), b"<w/>")
+        paths.append(path)
+
+    assert content_digest(paths[0]) == content_digest(paths[1])
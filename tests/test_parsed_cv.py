@@ -0,0 +1,61 @@
+import msgpack
+import pytest
+
+import app as app_module
+from parsed_cv import MSGPACK_MIMETYPE, SCHEMA_VERSION, ParsedCV
+
+PARSED = {
+    "name": "Jane Doe",
+    "contact": {"email": "jane@example.com", "phone": "+15550100"},
+    "position": "Data Analyst",
+    "years_of_experience": 7,
+    "education": "BSc Statistics",
+    "certificates": "Tableau Desktop Specialist",
+    "languages": "English, French",
+    "skills": "Python, SQL",
+    "experience": [
+        {
+            "dates": "2018-2024",
+            "location": "Berlin",
+            "role": "Data Analyst",
+            "company": "Acme",
+            "description": "Reporting pipelines",
+        }
+    ],
+}
+
+
+def test_msgpack_round_trip():
+    record = ParsedCV.from_dict(PARSED)
+
+    decoded = ParsedCV.from_msgpack(record.to_msgpack())
+
+    assert decoded == record
+    assert decoded.to_dict() == PARSED
+
+
+def test_msgpack_rejects_other_schema_versions():
+    data = ParsedCV.from_dict(PARSED).to_list()
+    data[0] = SCHEMA_VERSION + 1
+
+    with pytest.raises(ValueError):
+        ParsedCV.from_msgpack(msgpack.packb(data))
+
+
+def test_api_parse_returns_msgpack_records(parser, monkeypatch):
+    monkeypatch.setattr(app_module, "_parser", parser)
+    client = app_module.app.test_client()
+
+    response = client.post(
+        "/api/parse",
+        json={"texts": ["Jane Doe\nSkills\nPython, SQL", " "]},
+        headers={"Accept": MSGPACK_MIMETYPE},
+    )
+
+    assert response.mimetype == MSGPACK_MIMETYPE
+    parsed, empty = msgpack.unpackb(response.data, raw=False)["results"]
+    assert parsed["source"] == "texts[0]"
+    assert ParsedCV.from_list(parsed["data"]).skills == "Python, SQL"
+    assert empty == {"source": "texts[1]", "error": "Empty text"}
+    # JSON stays the default
+    assert client.post("/api/parse", json={"texts": "Jane Doe"}).is_json
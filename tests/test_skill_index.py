@@ -0,0 +1,49 @@
+import pytest
+
+from skill_index import SKILLS_NOT_FOUND, SkillIndex, normalize_skill, skill_names
+
+
+@pytest.mark.parametrize(
+    "text, key",
+    [
+        ("Python", "python"),
+        ("  Python3 ", "python"),
+        ("Python 3.11", "python"),
+        ("Angular-2", "angular"),
+        ("HTML5", "html"),
+        ("Machine   Learning", "machine learning"),
+        # Short names keep their digits
+        ("S3", "s3"),
+        ("EC2", "ec2"),
+        ("ES6", "es6"),
+        ("D3", "d3"),
+    ],
+)
+def test_normalize_skill(text, key):
+    assert normalize_skill(text) == key
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SkillIndex.from_file()
+
+
+@pytest.mark.parametrize("text", ["py", "Python3", "python", "PYTHON"])
+def test_aliases_share_one_canonical_skill(index, text):
+    assert index.canonicalize(text) == ("python", "Python")
+
+
+def test_short_versioned_names_stay_distinct(index):
+    keys = {index.canonicalize(text)[0] for text in ["S3", "EC2", "ES6"]}
+
+    assert len(keys) == 3
+    assert keys.isdisjoint({"s", "ec", "es"})
+
+
+def test_unknown_skills_are_their_own_canonical_skill(index):
+    assert index.canonicalize(" QlikView 12 ") == ("qlikview", "QlikView 12")
+
+
+def test_skill_names_drop_the_parser_sentinel():
+    assert skill_names("Python, , SQL ") == ["Python", "SQL"]
+    assert skill_names(SKILLS_NOT_FOUND) == []
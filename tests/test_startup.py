@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+import check_startup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("module", ["app", "cv_processor"])
+def test_entry_points_import_no_heavy_modules(module, monkeypatch):
+    # The profiled interpreter imports the module from its working directory
+    monkeypatch.chdir(ROOT)
+
+    assert check_startup.check(module) == []
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+import vector_index
+from vector_index import VectorIndex, index_cv
+
+
+def unit_vectors(count, dim=16, seed=0):
+    vectors = np.random.default_rng(seed).normal(size=(count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(
+        np.float32
+    )
+
+
+def filled_index(folder, vectors, first_id=1):
+    index = VectorIndex(str(folder))
+    for offset, vector in enumerate(vectors):
+        index.add(first_id + offset, vector)
+    return index
+
+
+def test_add_and_exact_search(tmp_path):
+    vectors = unit_vectors(10)
+    index = filled_index(tmp_path, vectors)
+
+    assert len(index) == 10
+    assert index.dim == 16
+    assert index.indexed_ids() == set(range(1, 11))
+    results = index.search(vectors[3], k=3, exact=True)
+    assert len(results) == 3
+    assert results[0][0] == 4
+    assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+    assert [score for _, score in results] == sorted(
+        (score for _, score in results), reverse=True
+    )
+    assert len(index.search(vectors[0], k=50)) == 10
+
+
+def test_search_rejects_k_below_one(tmp_path):
+    index = filled_index(tmp_path, unit_vectors(2))
+
+    for k in (0, -2):
+        with pytest.raises(ValueError):
+            index.search(unit_vectors(1)[0], k=k)
+
+
+def test_empty_index_and_dimension_mismatch(tmp_path):
+    index = VectorIndex(str(tmp_path))
+    assert index.search(unit_vectors(1)[0], k=3) == []
+
+    index.add(1, unit_vectors(1)[0])
+    with pytest.raises(ValueError):
+        index.add(2, unit_vectors(1, dim=8)[0])
+
+
+def test_ann_results_merge_with_rows_added_after_the_build(tmp_path):
+    pytest.importorskip("hnswlib")
+    vectors = unit_vectors(60)
+    index = filled_index(tmp_path, vectors[:50])
+    assert index.build_ann() == 50
+    # Rows added after the build are only reachable through the exact tail scan
+    for offset, vector in enumerate(vectors[50:]):
+        index.add(51 + offset, vector)
+
+    for query in (vectors[7], vectors[55], unit_vectors(1, seed=1)[0]):
+        approximate = index.search(query, k=5)
+        exact = index.search(query, k=5, exact=True)
+        assert [cv_id for cv_id, _ in approximate] == [cv_id for cv_id, _ in exact]
+        assert [score for _, score in approximate] == pytest.approx(
+            [score for _, score in exact], abs=1e-5
+        )
+    assert index.search(vectors[55], k=1)[0][0] == 56
+
+
+def test_index_cv_logs_instead_of_failing(tmp_path, monkeypatch):
+    def missing_model(nlp=None):
+        raise OSError("Can't find model 'en_core_web_md'")
+
+    monkeypatch.setattr(vector_index, "get_embedder", missing_model)
+
+    assert index_cv(1, {"position": "Data Analyst"}) is False
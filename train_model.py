@@ -0,0 +1,125 @@
+import argparse
+import glob
+import json
+import os
+import random
+from pathlib import Path
+
+import spacy
+from spacy.tokens import DocBin
+from spacy.util import filter_spans
+
+DATA_FILES = ["data.json", "data/*.json"]
+CONFIG_PATH = "config.cfg"
+TRAIN_PATH = "train.spacy"
+DEV_PATH = "dev.spacy"
+TRAINING_OUTPUT = "training"
+MODEL_NAME = "cv_ner"
+MODEL_VERSION = "0.0.1"
+PACKAGES_OUTPUT = "packages"
+
+
+def load_annotations(patterns=DATA_FILES):
+    """Load ``(text, entities)`` pairs from the annotated JSON files."""
+    examples = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+            for annotation in data.get("annotations", []):
+                if not annotation:
+                    continue
+                text, labels = annotation
+                examples.append((text, labels.get("entities", [])))
+    return examples
+
+
+def to_docbin(nlp, examples):
+    """Convert annotated examples into a ``DocBin``, skipping misaligned spans."""
+    doc_bin = DocBin()
+    for text, entities in examples:
+        doc = nlp.make_doc(text)
+        spans = []
+        for start, end, label in entities:
+            span = doc.char_span(start, end, label=label, alignment_mode="contract")
+            if span is None:
+                print(f"Skipping misaligned entity {text[start:end]!r} ({label})")
+                continue
+            spans.append(span)
+        doc.ents = filter_spans(spans)
+        doc_bin.add(doc)
+    return doc_bin
+
+
+def split_annotations(dev_ratio=0.2, seed=0):
+    """Return the seeded ``(train, dev)`` split of the annotations.
+
+    ``evaluate.py`` scores on the same dev examples, so the trained model is
+    never measured on its own training data.
+    """
+    examples = load_annotations()
+    if len(examples) < 2:
+        raise ValueError("At least two annotated examples are needed to train.")
+    random.Random(seed).shuffle(examples)
+    dev_size = max(1, int(len(examples) * dev_ratio))
+    return examples[dev_size:], examples[:dev_size]
+
+
+def convert(dev_ratio=0.2, seed=0):
+    """Split the annotations into train/dev sets and write them as ``.spacy`` files."""
+    train_examples, dev_examples = split_annotations(dev_ratio, seed)
+    nlp = spacy.blank("en")
+    to_docbin(nlp, train_examples).to_disk(TRAIN_PATH)
+    to_docbin(nlp, dev_examples).to_disk(DEV_PATH)
+    print(
+        f"Wrote {len(train_examples)} training and {len(dev_examples)} dev examples "
+        f"to {TRAIN_PATH} and {DEV_PATH}"
+    )
+
+
+def train(use_gpu=-1):
+    """Train the tok2vec + ner pipeline described in config.cfg."""
+    from spacy.cli.train import train as spacy_train
+
+    spacy_train(
+        CONFIG_PATH,
+        TRAINING_OUTPUT,
+        use_gpu=use_gpu,
+        overrides={"paths.train": TRAIN_PATH, "paths.dev": DEV_PATH},
+    )
+    print(f"Best model saved to {os.path.join(TRAINING_OUTPUT, 'model-best')}")
+
+
+def package():
+    """Package the best trained model as an installable ``en_cv_ner`` package."""
+    from spacy.cli.package import package as spacy_package
+
+    os.makedirs(PACKAGES_OUTPUT, exist_ok=True)
+    spacy_package(
+        Path(TRAINING_OUTPUT) / "model-best",
+        Path(PACKAGES_OUTPUT),
+        name=MODEL_NAME,
+        version=MODEL_VERSION,
+        create_sdist=True,
+        force=True,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Train the CV-specific NER model from the annotated data."
+    )
+    parser.add_argument(
+        "step",
+        choices=["convert", "train", "package", "all"],
+        help="Pipeline step to run",
+    )
+    parser.add_argument("--gpu", type=int, default=-1, help="GPU id, -1 for CPU")
+    args = parser.parse_args()
+
+    if args.step in ("convert", "all"):
+        convert()
+    if args.step in ("train", "all"):
+        train(use_gpu=args.gpu)
+    if args.step in ("package", "all"):
+        package()
@@ -0,0 +1,237 @@
+import fcntl
+import json
+import os
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:  # Optional: exact search is used without it
+    hnswlib = None
+
+INDEX_FOLDER = os.environ.get("CV_INDEX_FOLDER", "index")
+EMBEDDING_MODEL = os.environ.get("CV_EMBEDDING_MODEL", "en_core_web_md")
+
+# Rows scored per matrix product in exact search, to bound temporary memory.
+SEARCH_CHUNK_ROWS = 65536
+
+
+def cv_embedding_text(parsed_data):
+    """Text a CV is embedded from: its position, skills and experience."""
+    parts = [parsed_data.get("position") or "", parsed_data.get("skills") or ""]
+    for experience in parsed_data.get("experience") or []:
+        parts.extend(
+            experience.get(key) or "" for key in ("role", "company", "description")
+        )
+    return "\n".join(part for part in parts if part)
+
+
+class TextEmbedder:
+    """Averages the static word vectors of a spaCy pipeline into a unit vector.
+
+    Only the tokenizer and the vocab vectors are used, so an already loaded
+    pipeline with vectors can be reused; otherwise ``EMBEDDING_MODEL`` is
+    loaded without its trainable components.
+    """
+
+    def __init__(self, nlp=None):
+        if nlp is None or not nlp.vocab.vectors.shape[0]:
+            import spacy
+
+            nlp = spacy.load(
+                EMBEDDING_MODEL,
+                exclude=[
+                    "tok2vec",
+                    "tagger",
+                    "parser",
+                    "attribute_ruler",
+                    "lemmatizer",
+                    "ner",
+                    "senter",
+                ],
+            )
+        self.nlp = nlp
+        self.dim = nlp.vocab.vectors.shape[1]
+
+    def embed(self, text):
+        vector = np.asarray(self.nlp.make_doc(text).vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """Append-only matrix of CV embeddings, memory-mapped for search.
+
+    Vectors are stored as raw float32 rows in ``vectors.f32`` next to their
+    CV ids in ``ids.i64``, so adding a CV is a file append and searching
+    never loads more than the pages it touches. When ``hnswlib`` is
+    installed, ``build_ann`` (run offline, e.g. from a cron job) saves an
+    approximate nearest-neighbour graph over the rows stored so far; searches
+    load it and score rows appended since then exactly.
+    """
+
+    def __init__(self, folder=INDEX_FOLDER):
+        self.folder = folder
+        self.vectors_path = os.path.join(folder, "vectors.f32")
+        self.ids_path = os.path.join(folder, "ids.i64")
+        self.meta_path = os.path.join(folder, "meta.json")
+        self.lock_path = os.path.join(folder, "index.lock")
+        self.ann_path = os.path.join(folder, "ann.bin")
+        self._ann = None
+        self._ann_mtime = None
+
+    @property
+    def dim(self):
+        if not os.path.isfile(self.meta_path):
+            return None
+        with open(self.meta_path) as file:
+            return json.load(file)["dim"]
+
+    def __len__(self):
+        if not os.path.isfile(self.ids_path):
+            return 0
+        return os.path.getsize(self.ids_path) // 8
+
+    def add(self, cv_id, vector):
+        """Append one CV vector; safe to call from several worker processes."""
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        os.makedirs(self.folder, exist_ok=True)
+        with open(self.lock_path, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            dim = self.dim
+            if dim is None:
+                with open(self.meta_path, "w") as file:
+                    json.dump({"dim": int(vector.shape[0])}, file)
+            elif dim != vector.shape[0]:
+                raise ValueError(
+                    f"Vector has {vector.shape[0]} dimensions, index expects {dim}"
+                )
+            with open(self.vectors_path, "ab") as file:
+                file.write(vector.tobytes())
+            with open(self.ids_path, "ab") as file:
+                file.write(np.int64(cv_id).tobytes())
+
+    def indexed_ids(self):
+        """Set of the CV ids stored in the index."""
+        _, ids = self._load()
+        return set() if ids is None else set(ids.tolist())
+
+    def _load(self):
+        count = len(self)
+        if not count:
+            return None, None
+        dim = self.dim
+        vectors = np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r", shape=(count, dim)
+        )
+        ids = np.memmap(self.ids_path, dtype=np.int64, mode="r", shape=(count,))
+        return vectors, ids
+
+    def build_ann(self, ef_construction=200, M=16):
+        """Build the HNSW graph over all stored vectors and save it; returns its size.
+
+        Building is slow, so it is done offline rather than by the first
+        query of every process.
+        """
+        if hnswlib is None:
+            raise RuntimeError("hnswlib is not installed")
+        vectors, _ = self._load()
+        if vectors is None:
+            return 0
+        count, dim = vectors.shape
+        ann = hnswlib.Index(space="ip", dim=dim)
+        ann.init_index(max_elements=count, ef_construction=ef_construction, M=M)
+        for start in range(0, count, SEARCH_CHUNK_ROWS):
+            end = min(start + SEARCH_CHUNK_ROWS, count)
+            ann.add_items(np.asarray(vectors[start:end]), np.arange(start, end))
+        temp_path = self.ann_path + ".tmp"
+        ann.save_index(temp_path)
+        os.replace(temp_path, self.ann_path)
+        return count
+
+    def _ann_index(self):
+        """Return the saved HNSW graph, reloading it when ``build_ann`` replaced it."""
+        try:
+            mtime = os.path.getmtime(self.ann_path)
+        except OSError:
+            return None
+        if self._ann is None or mtime != self._ann_mtime:
+            ann = hnswlib.Index(space="ip", dim=self.dim)
+            ann.load_index(self.ann_path)
+            self._ann, self._ann_mtime = ann, mtime
+        return self._ann
+
+    @staticmethod
+    def _exact_top(vectors, query, k, start=0):
+        """``(row, score)`` of the ``k`` best rows from ``start`` on (chunked scan)."""
+        count = len(vectors) - start
+        if count <= 0:
+            return []
+        scores = np.empty(count, dtype=np.float32)
+        for offset in range(0, count, SEARCH_CHUNK_ROWS):
+            rows = vectors[start + offset : start + offset + SEARCH_CHUNK_ROWS]
+            scores[offset : offset + SEARCH_CHUNK_ROWS] = rows @ query
+        k = min(k, count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return [(start + int(row), float(scores[row])) for row in top]
+
+    def search(self, vector, k=10, exact=False):
+        """Return up to ``k`` ``(cv_id, score)`` pairs by cosine similarity."""
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        vectors, ids = self._load()
+        if vectors is None:
+            return []
+        query = np.asarray(vector, dtype=np.float32).reshape(-1)
+
+        ann = None if hnswlib is None or exact else self._ann_index()
+        ann_count = ann.get_current_count() if ann is not None else 0
+        if ann_count > len(ids):
+            ann, ann_count = None, 0  # Stale graph from a rebuilt index
+        candidates = []
+        if ann is not None:
+            ann.set_ef(max(k * 2, 50))
+            rows, distances = ann.knn_query(query, k=min(k, ann_count))
+            candidates = [
+                (int(row), float(1 - distance))
+                for row, distance in zip(rows[0], distances[0])
+            ]
+        # Rows appended after the graph was built are scored exactly
+        candidates.extend(self._exact_top(vectors, query, k, start=ann_count))
+        candidates.sort(key=lambda candidate: -candidate[1])
+        return [(int(ids[row]), score) for row, score in candidates[:k]]
+
+
+_embedder = None
+_vector_index = None
+
+
+def get_embedder(nlp=None):
+    """Return the shared embedder, reusing ``nlp`` when it carries vectors."""
+    global _embedder
+    if _embedder is None:
+        _embedder = TextEmbedder(nlp)
+    return _embedder
+
+
+def get_vector_index():
+    global _vector_index
+    if _vector_index is None:
+        _vector_index = VectorIndex()
+    return _vector_index
+
+
+def index_cv(cv_id, parsed_data, nlp=None):
+    """Add a saved CV to the shared index; returns whether it was added.
+
+    The CV row is already committed, so a failure here (e.g. no vector model
+    installed) is logged rather than failing the upload, which a retry would
+    save twice. ``flask --app app backfill-index`` adds the CV later.
+    """
+    try:
+        vector = get_embedder(nlp).embed(cv_embedding_text(parsed_data))
+        get_vector_index().add(cv_id, vector)
+    except Exception as e:
+        print(f"Error adding CV {cv_id} to the vector index: {e}")
+        return False
+    return True
@@ -0,0 +1,64 @@
+"""RQ worker for ``tasks.parse_cv``: ``python worker.py [queue ...]``.
+
+The worker owns one Flask app and therefore one SQLAlchemy engine for its
+whole lifetime. Every job runs in its own app context, so it gets a fresh
+session whose connections go back to the pool when the job ends, and the
+engine is disposed when the worker exits.
+
+By default each job runs in a forked work horse, like ``rq worker``: RQ can
+kill it at ``job_timeout`` even inside a C extension, and the memory a huge
+document needed is returned when it exits. ``CV_WORKER_FORK=0`` runs jobs in
+the worker process instead, reusing pooled connections across jobs at the
+cost of that isolation (see ``ProcessingLimits``).
+"""
+
+import os
+import sys
+
+from rq import SimpleWorker, Worker
+
+from app import app
+from connections import get_redis, pool_metrics
+from models import db
+
+
+class _AppContextMixin:
+    def perform_job(self, job, queue):
+        with app.app_context():
+            try:
+                return super().perform_job(job, queue)
+            finally:
+                print(f"Pools: {pool_metrics(db.engine)}")
+
+
+class CVWorker(_AppContextMixin, Worker):
+    """Runs each job in a forked work horse, as ``rq worker`` does.
+
+    Connections inherited from the parent must not be shared with the horse,
+    so it starts from an empty pool.
+    """
+
+    def main_work_horse(self, job, queue):
+        with app.app_context():
+            db.engine.dispose(close=False)
+        super().main_work_horse(job, queue)
+
+
+class InProcessCVWorker(_AppContextMixin, SimpleWorker):
+    """Runs jobs in the worker process, so pooled connections are reused across jobs.
+
+    ``job_timeout`` is only enforced with SIGALRM, which cannot interrupt a
+    long call inside a C extension, a job that crashes the interpreter takes
+    the worker down with it, and memory used by one job stays in the process.
+    """
+
+
+if __name__ == "__main__":
+    fork = os.environ.get("CV_WORKER_FORK", "1") != "0"
+    worker_class = CVWorker if fork else InProcessCVWorker
+    worker = worker_class(sys.argv[1:] or ["default"], connection=get_redis())
+    try:
+        worker.work()
+    finally:
+        with app.app_context():
+            db.engine.dispose()